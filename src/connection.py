@@ -4,17 +4,45 @@ This module provides functionality to connect to Teradata databases
 using configuration from YAML files.
 """
 
+import copy
+import functools
+import json
 import logging
+import mmap
+import os
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, Any, Generator
+from typing import Optional, Dict, Any, FrozenSet, Generator, Iterable, Tuple
 from contextlib import contextmanager
 
 import yaml
-from sqlalchemy import create_engine, text
-from sqlalchemy.engine import Engine
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import URL, Engine
+
+# Prefer the libyaml-backed loader when PyYAML was built with it.
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 logger = logging.getLogger(__name__)
 
+# Parsed configuration files keyed by (resolved path, mtime_ns, size); editing
+# the file changes the key, so stale entries simply age out of the LRU.
+_YAML_CACHE: "OrderedDict[Tuple[str, int, int], Dict[str, Any]]" = OrderedDict()
+_YAML_CACHE_MAX_ENTRIES = 100
+
+# Pool settings used when neither get_engine arguments nor td_env.yaml set them.
+# Recycling guards against Teradata's idle disconnects more cheaply than
+# pinging on every checkout.
+_POOL_DEFAULTS: Dict[str, Optional[int]] = {
+    "pool_size": 10,
+    "max_overflow": 10,
+    "pool_recycle": 1800,
+    "pool_timeout": 30,
+}
+
 
 class TeradataConnectionError(Exception):
     """Exception raised for Teradata connection errors."""
@@ -22,6 +50,55 @@ class TeradataConnectionError(Exception):
     pass
 
 
+# Spellings accepted for boolean settings given as strings in td_env.yaml.
+_BOOL_STRINGS = {
+    "true": True,
+    "yes": True,
+    "on": True,
+    "false": False,
+    "no": False,
+    "off": False,
+}
+
+
+def _parse_bool(name: str, value: Any) -> bool:
+    """Interpret a boolean configuration value.
+
+    Args:
+        name: Setting name, used in the error message.
+        value: A bool, or a string such as 'true', 'no' or 'off'.
+
+    Returns:
+        The parsed flag.
+
+    Raises:
+        TeradataConnectionError: If the value is neither a bool nor a
+            recognised string.
+    """
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        parsed = _BOOL_STRINGS.get(value.strip().lower())
+        if parsed is not None:
+            return parsed
+    raise TeradataConnectionError(f"{name} must be true or false, got {value!r}")
+
+
+def _dispose_engines(engines: Dict[str, Engine]) -> None:
+    """Dispose and forget every engine in the registry.
+
+    Used as the ``weakref.finalize`` callback for ``TeradataConnection``, so it
+    only receives the engine dict and must not reference the manager itself.
+    """
+    for env_name, engine in list(engines.items()):
+        try:
+            engine.dispose()
+            logger.info(f"Closed connection to '{env_name}'")
+        except Exception as e:  # pragma: no cover - best effort on teardown
+            logger.warning(f"Error closing connection to '{env_name}': {e}")
+    engines.clear()
+
+
 class TeradataConnection:
     """Manages Teradata database connections.
 
@@ -35,11 +112,27 @@ class TeradataConnection:
         ...     df = pd.read_sql("SELECT * FROM table", engine)
     """
 
-    def __init__(self, config_path: Optional[str] = None):
+    def __init__(
+        self,
+        config_path: Optional[str] = None,
+        eager_envs: Optional[Iterable[str]] = None,
+        validate_on_create: Optional[bool] = None,
+    ):
         """Initialize the connection manager.
 
         Args:
             config_path: Path to YAML config file. Defaults to 'td_env.yaml'.
+            eager_envs: Environments whose engines and first pooled
+                connection are created in the background right away, so the
+                first report does not pay for the logon.
+            validate_on_create: Run ``SELECT 1`` when an engine is created.
+                None (the default) validates only environments with pre-ping
+                enabled.
+
+        Raises:
+            TeradataConnectionError: If the configuration is invalid or an
+                eager environment is not configured.
+            TypeError: If eager_envs is a single string.
         """
         if config_path is None:
             self.config_path: Path = Path(__file__).parent.parent / "td_env.yaml"
@@ -48,7 +141,19 @@ class TeradataConnection:
 
         self._config: Dict[str, Dict[str, Any]] = {}
         self._engines: Dict[str, Engine] = {}
+        # Dispose engines when the manager is garbage collected or at exit
+        self._finalizer = weakref.finalize(self, _dispose_engines, self._engines)
+        self._engines_lock = threading.Lock()
+        self._env_locks: Dict[str, threading.Lock] = {}
+        self._urls: Dict[str, URL] = {}
+        self._env_set: FrozenSet[str] = frozenset()
+        self._env_tuple: Tuple[str, ...] = ()
+        self._validate_on_create = validate_on_create
+        self._prefetch: Tuple["Future[None]", ...] = ()
         self._load_config()
+        self._build_urls()
+        if eager_envs is not None:
+            self._prewarm(eager_envs)
 
     def _load_config(self) -> None:
         """Load connection configuration from YAML file.
@@ -63,41 +168,175 @@ class TeradataConnection:
             )
 
         try:
-            with open(self.config_path, "r") as f:
-                self._config = yaml.safe_load(f)
+            st = os.stat(self.config_path)
+            cache_key = (str(self.config_path.resolve()), st.st_mtime_ns, st.st_size)
+            cached = _YAML_CACHE.get(cache_key)
+            if cached is not None:
+                _YAML_CACHE.move_to_end(cache_key)
+                self._config = copy.deepcopy(cached)
+                logger.debug(f"Using cached configuration for {self.config_path}")
+            else:
+                sidecar = self._read_sidecar(st)
+                if sidecar is not None:
+                    self._config = sidecar
+                else:
+                    self._config = self._parse_yaml(st)
 
-            if not isinstance(self._config, dict):
-                raise TeradataConnectionError(
-                    f"Invalid configuration format in {self.config_path}"
-                )
+                    if not isinstance(self._config, dict):
+                        raise TeradataConnectionError(
+                            f"Invalid configuration format in {self.config_path}"
+                        )
+
+                    self._write_sidecar(st)
+
+                _YAML_CACHE[cache_key] = copy.deepcopy(self._config)
+                if len(_YAML_CACHE) > _YAML_CACHE_MAX_ENTRIES:
+                    _YAML_CACHE.popitem(last=False)
+
+                logger.info(f"Loaded configuration for: {list(self._config.keys())}")
 
-            logger.info(f"Loaded configuration for: {list(self._config.keys())}")
+            self._env_set = frozenset(self._config)
+            self._env_tuple = tuple(self._config)
 
         except yaml.YAMLError as e:
             raise TeradataConnectionError(f"Error parsing YAML configuration: {e}")
         except Exception as e:
             raise TeradataConnectionError(f"Error loading configuration: {e}")
 
-    def _build_connection_string(self, env_name: str) -> str:
-        """Build Teradata connection string from configuration.
+    def _parse_yaml(self, config_stat: os.stat_result) -> Any:
+        """Parse the YAML file from a read-only memory map.
+
+        libyaml reads the mapped bytes directly, skipping Python's text
+        decoding layer. Empty files cannot be mapped and parse as None.
+
+        Args:
+            config_stat: Result of ``os.stat`` on the YAML configuration file.
+        """
+        if config_stat.st_size == 0:
+            return None
+        with open(self.config_path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                return yaml.load(mm, Loader=_SafeLoader)
+            finally:
+                mm.close()
+
+    @property
+    def _sidecar_path(self) -> Path:
+        """Path of the JSON copy of the parsed configuration."""
+        return self.config_path.with_name(f".{self.config_path.name}.json")
+
+    def _read_sidecar(self, config_stat: os.stat_result) -> Optional[Dict[str, Any]]:
+        """Read the JSON sidecar if it was written from the current YAML file.
+
+        Args:
+            config_stat: Result of ``os.stat`` on the YAML configuration file.
+
+        Returns:
+            Parsed configuration, or None if the sidecar is missing, stale or
+            unreadable.
+        """
+        try:
+            payload = json.loads(self._sidecar_path.read_bytes())
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(payload, dict):
+            return None
+        source = [config_stat.st_mtime_ns, config_stat.st_size]
+        config = payload.get("config")
+        if payload.get("source") != source or not isinstance(config, dict):
+            return None
+        logger.debug(f"Loaded configuration from sidecar {self._sidecar_path}")
+        return config
+
+    def _write_sidecar(self, config_stat: os.stat_result) -> None:
+        """Write the parsed configuration to the JSON sidecar.
+
+        The sidecar records the YAML file's mtime and size so any later edit
+        makes it stale. It holds the same credentials as the YAML file, so it
+        is created owner-only (0600) under a unique temporary name before any
+        bytes are written, then moved into place. It is only written when the
+        configuration survives a JSON round trip unchanged. Failures (e.g.
+        read-only directories) are logged and otherwise ignored.
+
+        Args:
+            config_stat: Result of ``os.stat`` on the YAML configuration file.
+        """
+        tmp: Optional[str] = None
+        try:
+            payload = json.dumps(self._config)
+            if json.loads(payload) != self._config:
+                return
+            source = json.dumps([config_stat.st_mtime_ns, config_stat.st_size])
+            data = f'{{"source": {source}, "config": {payload}}}'.encode()
+            # mkstemp opens with O_CREAT | O_EXCL and mode 0600.
+            fd, tmp = tempfile.mkstemp(
+                dir=self._sidecar_path.parent,
+                prefix=f"{self._sidecar_path.name}.",
+                suffix=".tmp",
+            )
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._sidecar_path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.debug(f"Could not write configuration sidecar: {e}")
+            if tmp is not None:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+
+    def _build_urls(self) -> None:
+        """Validate every environment and precompute its connection URL.
+
+        Raises:
+            TeradataConnectionError: If any environment is misconfigured.
+        """
+        self._urls = {
+            env_name: self._build_url(env_name, config)
+            for env_name, config in self._config.items()
+        }
+
+    def _build_connection_string(self, env_name: str) -> URL:
+        """Return the precomputed connection URL for an environment.
 
         Args:
             env_name: Environment name (e.g., 'test', 'prod').
 
         Returns:
-            SQLAlchemy connection string.
+            SQLAlchemy URL; its string form masks the password.
 
         Raises:
             TeradataConnectionError: If environment not found in config.
         """
-        if env_name not in self._config:
+        url = self._urls.get(env_name)
+        if url is None:
             available = list(self._config.keys())
             raise TeradataConnectionError(
                 f"Environment '{env_name}' not found in configuration. "
                 f"Available: {available}"
             )
+        return url
 
-        config = self._config[env_name]
+    @staticmethod
+    def _build_url(env_name: str, config: Any) -> URL:
+        """Build Teradata connection URL from one environment's configuration.
+
+        Args:
+            env_name: Environment name, used in error messages.
+            config: The environment's configuration mapping.
+
+        Returns:
+            SQLAlchemy URL; its string form masks the password.
+
+        Raises:
+            TeradataConnectionError: If required parameters are missing.
+        """
+        if not isinstance(config, dict):
+            raise TeradataConnectionError(
+                f"Invalid configuration for '{env_name}': expected a mapping"
+            )
 
         # Required parameters
         logmech = config.get("logmech", "TD2")
@@ -124,34 +363,128 @@ class TeradataConnection:
                 "with logmech=BROWSER"
             )
 
-        if browser_auth:
-            if username:
-                auth_segment = f"{username}"
-                if password:
-                    auth_segment += f":{password}"
-                auth_segment += "@"
-            else:
-                auth_segment = "@"
-        else:
-            auth_segment = f"{username}:{password}@"
-        conn_string = (
-                f"teradatasql://{auth_segment}{host}/{database}?logmech={logmech_value}"
-            )
-        logger.info(f"Connection string: {conn_string}")
-        # Add optional parameters
+        query = {"LOGMECH": logmech_value}
         if "tmode" in config:
-            conn_string += f"&TMODE={config['tmode']}"
+            query["TMODE"] = str(config["tmode"])
         if "charset" in config:
-            conn_string += f"&CHARSET={config['charset']}"
+            query["CHARSET"] = str(config["charset"])
+        if "encryptdata" in config:
+            encrypt = _parse_bool(
+                f"encryptdata for '{env_name}'", config["encryptdata"]
+            )
+            query["ENCRYPTDATA"] = str(encrypt).lower()
+
+        # URL.create escapes credentials, so passwords containing '@', ':',
+        # '/' or '%' survive intact.
+        url = URL.create(
+            "teradatasql",
+            username=str(username) if username is not None else None,
+            password=str(password) if password is not None else None,
+            host=str(host),
+            database=str(database),
+            query=query,
+        )
+        logger.debug(f"Connection URL for '{env_name}': {url}")
+
+        return url
+
+    def _pool_options(
+        self, env_name: str, overrides: Dict[str, Optional[int]]
+    ) -> Dict[str, Any]:
+        """Resolve pool settings from arguments, configuration and defaults.
+
+        Explicit (non-None) arguments win, then the environment's ``pool``
+        mapping (keys ``size``, ``max_overflow``, ``recycle``, ``timeout``,
+        ``pre_ping``), then top-level ``pool_*`` keys, then ``_POOL_DEFAULTS``.
+        Pre-ping is only enabled by default when recycling is turned off.
+
+        Args:
+            env_name: Environment name (e.g., 'test', 'prod').
+            overrides: Keyword arguments passed to ``get_engine``.
+
+        Returns:
+            Keyword arguments for ``create_engine``.
+        """
+        config = self._config[env_name]
+        pool_config = config.get("pool") or {}
+
+        options: Dict[str, Any] = {}
+        for key, default in _POOL_DEFAULTS.items():
+            value = overrides.get(key)
+            if value is None:
+                short_key = key[len("pool_") :] if key.startswith("pool_") else key
+                value = pool_config.get(short_key, config.get(key, default))
+            options[key] = value
+
+        pre_ping = pool_config.get("pre_ping", config.get("pool_pre_ping"))
+        if pre_ping is None:
+            pre_ping = options["pool_recycle"] is None
+        options["pool_pre_ping"] = _parse_bool(
+            f"pool pre_ping for '{env_name}'", pre_ping
+        )
+        if options["pool_recycle"] is None:
+            options["pool_recycle"] = -1  # SQLAlchemy's "never recycle"
+        return options
+
+    @staticmethod
+    def _query_band(env_name: str, config: Dict[str, Any]) -> Optional[str]:
+        """Build the session QueryBand for an environment, if enabled.
+
+        ``query_band: true`` tags sessions with ``Application=PDCRReport``
+        and ``Env=<env_name>``; a mapping adds to or overrides those pairs.
+        Stable bands let Teradata workload rules and the request cache
+        recognise report traffic.
 
-        return conn_string
+        Args:
+            env_name: Environment name (e.g., 'test', 'prod').
+            config: The environment's configuration.
 
-    def get_engine(self, env_name: str, pool_size: int = 5) -> Engine:
+        Returns:
+            Band text such as ``Application=PDCRReport;Env=prod;``, or None.
+
+        Raises:
+            TeradataConnectionError: If the setting is invalid.
+        """
+        setting = config.get("query_band")
+        if not setting:
+            return None
+        pairs = {"Application": "PDCRReport", "Env": env_name}
+        if isinstance(setting, dict):
+            pairs.update({str(k): str(v) for k, v in setting.items()})
+        elif setting is not True:
+            raise TeradataConnectionError(
+                f"query_band for '{env_name}' must be true or a mapping"
+            )
+        for item in (*pairs, *pairs.values()):
+            if any(ch in item for ch in "';="):
+                raise TeradataConnectionError(
+                    f"Invalid query_band entry for '{env_name}': {item!r}"
+                )
+        return "".join(f"{key}={value};" for key, value in pairs.items())
+
+    def get_engine(
+        self,
+        env_name: str,
+        pool_size: Optional[int] = None,
+        max_overflow: Optional[int] = None,
+        pool_recycle: Optional[int] = None,
+        pool_timeout: Optional[int] = None,
+    ) -> Engine:
         """Get or create a SQLAlchemy engine for the environment.
 
+        Pool settings not passed here are read from the environment's
+        ``pool`` configuration, falling back to a pool of 10 with 10
+        overflow connections, 1800s recycling and a 30s checkout timeout.
+        Pre-ping (an extra round-trip per checkout) is off unless configured
+        or recycling is disabled with ``recycle: null``. Arguments only apply
+        when the engine is first created.
+
         Args:
             env_name: Environment name (e.g., 'test', 'prod').
-            pool_size: Connection pool size. Defaults to 5.
+            pool_size: Connections kept open in the pool.
+            max_overflow: Connections allowed beyond pool_size.
+            pool_recycle: Seconds before a pooled connection is replaced.
+            pool_timeout: Seconds to wait for a connection from the pool.
 
         Returns:
             SQLAlchemy Engine instance.
@@ -159,29 +492,113 @@ class TeradataConnection:
         Raises:
             TeradataConnectionError: If connection cannot be established.
         """
-        if env_name not in self._engines:
+        engine = self._engines.get(env_name)
+        if engine is not None:
+            return engine
+
+        # One lock per environment so concurrent first use creates (and
+        # tests) a single engine without serializing unrelated environments.
+        with self._engines_lock:
+            env_lock = self._env_locks.setdefault(env_name, threading.Lock())
+
+        with env_lock:
+            engine = self._engines.get(env_name)
+            if engine is not None:
+                return engine
+
             try:
-                conn_string = self._build_connection_string(env_name)
-                print("Connection string:", conn_string)
+                url = self._build_connection_string(env_name)
+                pool_options = self._pool_options(
+                    env_name,
+                    {
+                        "pool_size": pool_size,
+                        "max_overflow": max_overflow,
+                        "pool_recycle": pool_recycle,
+                        "pool_timeout": pool_timeout,
+                    },
+                )
                 engine = create_engine(
-                    conn_string,
-                    pool_size=pool_size,
-                    pool_pre_ping=True,  # Verify connections before using
-                    #echo=False,
-                    echo=True,  # Enable SQL query logging
+                    url,
+                    echo=False,
+                    **pool_options,
                 )
 
-                # Test connection
-                with engine.connect() as conn:
-                    conn.execute(text("SELECT 1"))
-
-                self._engines[env_name] = engine
-                logger.info(f"Created connection to '{env_name}' environment")
+                query_band = self._query_band(env_name, self._config[env_name])
+                if query_band is not None:
+                    set_band = f"SET QUERY_BAND = '{query_band}' FOR SESSION"
+
+                    # Runs once per new pooled connection, not per checkout.
+                    def _set_query_band(dbapi_conn: Any, _record: Any) -> None:
+                        cursor = dbapi_conn.cursor()
+                        try:
+                            cursor.execute(set_band)
+                        finally:
+                            cursor.close()
+
+                    event.listen(engine, "connect", _set_query_band)
+
+                # By default only probe the server up front when pre-ping is
+                # enabled; otherwise the first query does the work.
+                validate = self._validate_on_create
+                if validate is None:
+                    validate = pool_options["pool_pre_ping"]
+                if validate:
+                    with engine.connect() as conn:
+                        conn.execute(text("SELECT 1"))
 
             except Exception as e:
                 raise TeradataConnectionError(f"Failed to connect to '{env_name}': {e}")
 
-        return self._engines[env_name]
+            self._engines[env_name] = engine
+            logger.info(f"Created connection to '{env_name}' environment")
+            return engine
+
+    def _prewarm(self, env_names: Iterable[str]) -> None:
+        """Create engines and one pooled connection per environment in the background.
+
+        Args:
+            env_names: Environments to warm up; may be empty.
+
+        Raises:
+            TeradataConnectionError: If an environment is not configured.
+            TypeError: If env_names is a single string.
+        """
+        if isinstance(env_names, str):
+            raise TypeError(
+                "eager_envs must be a collection of environment names, "
+                f"not the string {env_names!r}"
+            )
+        env_names = tuple(dict.fromkeys(env_names))
+        if not env_names:
+            return
+        unknown = [env for env in env_names if env not in self._urls]
+        if unknown:
+            raise TeradataConnectionError(
+                f"Cannot prefetch unknown environments {unknown}. "
+                f"Available: {list(self._env_tuple)}"
+            )
+
+        def warm(env_name: str) -> None:
+            # Checking a connection out and back in leaves it logged on in
+            # the pool for the first real query.
+            with self.get_engine(env_name).connect():
+                pass
+
+        def report(env_name: str, future: "Future[None]") -> None:
+            exc = future.exception()
+            if exc is not None:
+                logger.warning(f"Prefetching '{env_name}' failed: {exc}")
+
+        executor = ThreadPoolExecutor(
+            max_workers=min(4, len(env_names)), thread_name_prefix="td-prefetch"
+        )
+        futures = []
+        for env_name in env_names:
+            future = executor.submit(warm, env_name)
+            future.add_done_callback(functools.partial(report, env_name))
+            futures.append(future)
+        executor.shutdown(wait=False)
+        self._prefetch = tuple(futures)
 
     @contextmanager
     def get_connection(self, env_name: str) -> Generator[Engine, None, None]:
@@ -207,23 +624,34 @@ class TeradataConnection:
 
     def close_all(self) -> None:
         """Close all database connections and dispose of engines."""
-        for env_name, engine in self._engines.items():
-            engine.dispose()
-            logger.info(f"Closed connection to '{env_name}'")
-        self._engines.clear()
+        _dispose_engines(self._engines)
 
-    def list_environments(self) -> list:
+    def list_environments(self) -> Tuple[str, ...]:
         """List available environment names from configuration.
 
         Returns:
-            List of environment names.
+            Tuple of environment names, in configuration order.
         """
-        return list(self._config.keys())
+        return self._env_tuple
+
+    def __contains__(self, env_name: object) -> bool:
+        """Return True if the environment is defined in the configuration."""
+        return env_name in self._env_set
+
+
+@functools.lru_cache(maxsize=8)
+def _get_manager(config_path: Optional[str]) -> TeradataConnection:
+    """Return the process-wide connection manager for a config path."""
+    return TeradataConnection(config_path)
 
 
 def get_connection(env_name: str, config_path: Optional[str] = None) -> Engine:
     """Convenience function to get a database connection.
 
+    Calls with the same ``config_path`` share one ``TeradataConnection``, so
+    the configuration is parsed once and engines (and their pools) are reused.
+    Use ``close_connections(config_path)`` to release them early.
+
     Args:
         env_name: Environment name (e.g., 'test', 'prod').
         config_path: Optional path to config file.
@@ -235,5 +663,20 @@ def get_connection(env_name: str, config_path: Optional[str] = None) -> Engine:
         >>> engine = get_connection('test')
         >>> df = pd.read_sql("SELECT * FROM table", engine)
     """
-    conn_mgr = TeradataConnection(config_path)
-    return conn_mgr.get_engine(env_name)
+    return _get_manager(config_path).get_engine(env_name)
+
+
+def close_connections(config_path: Optional[str] = None) -> None:
+    """Dispose the engines opened by ``get_connection`` for a config path.
+
+    The shared manager stays cached, so a later ``get_connection`` call
+    recreates its engine on demand.
+
+    Args:
+        config_path: Config path previously passed to ``get_connection``.
+
+    Example:
+        >>> engine = get_connection('test')
+        >>> close_connections()
+    """
+    _get_manager(config_path).close_all()
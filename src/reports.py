@@ -4,20 +4,507 @@ This module provides classes for generating various reports from
 Teradata PDCR (Performance Data Collection and Reporting) data.
 """
 
+import functools
+import hashlib
 import logging
+import os
+import threading
 import time
-from datetime import date, timedelta
-from typing import Optional, Union
+import warnings
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Hashable,
+    Iterator,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
 
 import pandas as pd
 from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql.elements import TextClause
 
 from .connection import TeradataConnection
 
+try:
+    import pyarrow
+
+    # Land results directly in Arrow-backed columns instead of object arrays.
+    _READ_SQL_OPTIONS: Dict[str, Any] = {"dtype_backend": "pyarrow"}
+    _HAS_PYARROW = True
+except ImportError:  # pragma: no cover - optional dependency
+    _READ_SQL_OPTIONS = {}
+    _HAS_PYARROW = False
+
 logger = logging.getLogger(__name__)
 
 DateLike = Union[str, date]
 
+_MATCH_MODES = ("prefix", "contains", "exact")
+_ROUND_TO = ("day", "hour", "none")
+
+# Rows per DataFrame when streaming results with iter_batches=True.
+_BATCH_SIZE = 50_000
+
+# Fan-out workers when the engine's pool does not report a size.
+_POOL_WORKERS = 4
+
+# Default SELECT lists, in result order. Each report may be narrowed to a
+# subset with ``columns=``; names outside these tuples are rejected, since
+# they are interpolated into the SQL rather than bound.
+_TABLESPACE_COLUMNS = (
+    "LogDate",
+    "DatabaseName",
+    "Tablename",
+    "AccountName",
+    "CURRENTPERM",
+    "PEAKPERM",
+    "CURRENTPERMSKEW",
+    "PEAKPERMSKEW",
+)
+_DBSPACE_COLUMNS = (
+    "LogDate",
+    "DatabaseName",
+    "AccountName",
+    "CURRENTPERM",
+    "PEAKPERM",
+    "MAXPERM",
+    "CURRENTPERMSKEW",
+    "PERMPCTUSED",
+)
+_SPOOL_COLUMNS = (
+    "LogDate",
+    "UserName",
+    "AccountName",
+    "CURRENTSPOOL",
+    "PEAKSPOOL",
+    "MAXSPOOL",
+    "PEAKSPOOLSKEW",
+    "CURRENTTEMP",
+    "PEAKTEMP",
+    "MAXTEMP",
+    "PEAKTEMPSKEW",
+)
+_DBQL_SUMMARY_COLUMNS = (
+    "LogDate",
+    "ProcID",
+    "CollectTimeStamp",
+    "UserID",
+    "ZoneID",
+    "UserName",
+    "AcctString",
+    "LogicalHostID",
+    "AppID",
+    "ClientID",
+    "ClientAddr",
+    "ProfileID",
+    "SessionID",
+    "QueryCount",
+    "ValueType",
+    "QuerySeconds",
+    "TotalIOCount",
+    "AMPCPUTime",
+    "ParserCPUTime",
+    "AMPCPUTimeNorm",
+    "ParserCPUTimeNorm",
+    "LowHist",
+    "HighHist",
+    "UsedIota",
+    "ReqPhysIO",
+    "ReqPhysIOKB",
+    "StartTime",
+    "StopTime",
+    "ProfileName",
+    "TotalIOInKB",
+    "ExtraField2",
+    "ExtraField3",
+    "ExtraField4",
+    "ExtraField5",
+    "ExtraField6",
+    "ExtraField7",
+    "ExtraField8",
+    "ExtraField9",
+)
+
+# Result columns that are not plain column references.
+_COLUMN_EXPRESSIONS = {"TotalIOInKB": "ExtraField1 AS TotalIOInKB"}
+
+# Templates take the SELECT list plus, per name filter, a column placeholder
+# (the raw column or TRIM(column) depending on the trim flag) and an operator
+# placeholder: LIKE, or '=' for exact matches of bare names. There
+# is no ORDER BY: a global sort on the AMPs delays the first row and is
+# usually redone by the caller, so sorting happens client-side on request.
+_TABLESPACE_SQL = """
+    SELECT
+        {select_list}
+    FROM PDCRINFO.TableSpace_Hst
+    WHERE Logdate BETWEEN :start_date AND :end_date
+      AND {DatabaseName} {database_name_op} :database_name;
+    """
+
+_DATABASESPACE_SQL = """
+    SELECT
+        {select_list}
+    FROM PDCRINFO.DatabaseSpace_Hst
+    WHERE Logdate BETWEEN :start_date AND :end_date
+      AND {DatabaseName} {database_name_op} :database_name;
+    """
+
+_SPOOL_SQL = """
+    SELECT
+        {select_list}
+    FROM PDCRINFO.SpoolSpace_Hst
+    WHERE Logdate BETWEEN :start_date AND :end_date
+      AND {UserName} {user_name_op} :user_name
+      AND {AccountName} {account_name_op} :account_name;
+    """
+
+_DBQL_SUMMARY_SQL = """
+    SELECT
+        {select_list}
+    FROM PDCRINFO.DBQLSummaryTbl_Hst
+    WHERE LogDate BETWEEN :start_date AND :end_date
+      AND {UserName} {user_name_op} :user_name;
+    """
+
+# Known result schemas for the NumPy backend, so perm and spool sizes come
+# back as nullable floats (they are FLOAT columns in PDCR) even when a batch
+# is all NULL. Names repeated on every history row (databases, users,
+# accounts) are categorical; per-object names such as Tablename stay plain
+# strings. The Arrow backend already types every column, so only the
+# categorical casts are applied there (see ``_read_kwargs``).
+_PARSE_DATES = ["LogDate"]
+_TABLESPACE_DTYPES = {
+    "DatabaseName": "category",
+    "Tablename": "string",
+    "AccountName": "category",
+    "CURRENTPERM": "Float64",
+    "PEAKPERM": "Float64",
+    "CURRENTPERMSKEW": "Float64",
+    "PEAKPERMSKEW": "Float64",
+}
+_DBSPACE_DTYPES = {
+    "DatabaseName": "category",
+    "AccountName": "category",
+    "CURRENTPERM": "Float64",
+    "PEAKPERM": "Float64",
+    "MAXPERM": "Float64",
+    "CURRENTPERMSKEW": "Float64",
+    "PERMPCTUSED": "Float64",
+}
+_SPOOL_DTYPES = {
+    "UserName": "category",
+    "AccountName": "category",
+    "CURRENTSPOOL": "Float64",
+    "PEAKSPOOL": "Float64",
+    "MAXSPOOL": "Float64",
+    "PEAKSPOOLSKEW": "Float64",
+    "CURRENTTEMP": "Float64",
+    "PEAKTEMP": "Float64",
+    "MAXTEMP": "Float64",
+    "PEAKTEMPSKEW": "Float64",
+}
+_DBQL_SUMMARY_DTYPES = {
+    "UserName": "category",
+    "AcctString": "category",
+    "AppID": "category",
+    "ClientID": "category",
+    "ProfileName": "category",
+}
+
+
+@dataclass(frozen=True, eq=False)
+class _ReportSpec:
+    """Static description of one PDCR history report.
+
+    Specs are module-level singletons compared by identity, so they can key
+    the query and read-option caches directly.
+
+    Attributes:
+        name: Short key used in result cache keys (e.g. 'tablespace').
+        label: Human-readable name used in log messages.
+        sql_template: SQL with ``{select_list}`` and, per filter, a column
+            placeholder and a ``{<bind parameter>_op}`` operator placeholder.
+        columns: Default SELECT list, in result order.
+        filters: (bind parameter, column) pairs matched with LIKE.
+        sort_columns: Columns ordered by when ``sort=True``.
+        dtypes: Known result dtypes; None skips dtype and LogDate parsing.
+    """
+
+    name: str
+    label: str
+    sql_template: str
+    columns: Tuple[str, ...]
+    filters: Tuple[Tuple[str, str], ...]
+    sort_columns: Tuple[str, ...]
+    dtypes: Optional[Dict[str, str]] = None
+    allowed_columns: FrozenSet[str] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "allowed_columns", frozenset(self.columns))
+
+
+_TABLESPACE = _ReportSpec(
+    name="tablespace",
+    label="TableSpace",
+    sql_template=_TABLESPACE_SQL,
+    columns=_TABLESPACE_COLUMNS,
+    filters=(("database_name", "DatabaseName"),),
+    sort_columns=("LogDate", "DatabaseName", "Tablename"),
+    dtypes=_TABLESPACE_DTYPES,
+)
+_DATABASESPACE = _ReportSpec(
+    name="databasespace",
+    label="DatabaseSpace",
+    sql_template=_DATABASESPACE_SQL,
+    columns=_DBSPACE_COLUMNS,
+    filters=(("database_name", "DatabaseName"),),
+    sort_columns=("LogDate", "DatabaseName", "AccountName"),
+    dtypes=_DBSPACE_DTYPES,
+)
+_SPOOLSPACE = _ReportSpec(
+    name="spoolspace",
+    label="SpoolSpace",
+    sql_template=_SPOOL_SQL,
+    columns=_SPOOL_COLUMNS,
+    filters=(("user_name", "UserName"), ("account_name", "AccountName")),
+    sort_columns=("LogDate", "UserName", "AccountName"),
+    dtypes=_SPOOL_DTYPES,
+)
+_DBQL_SUMMARY = _ReportSpec(
+    name="dbql_summary",
+    label="DBQL Summary",
+    sql_template=_DBQL_SUMMARY_SQL,
+    columns=_DBQL_SUMMARY_COLUMNS,
+    filters=(("user_name", "UserName"),),
+    sort_columns=("LogDate", "UserName"),
+    dtypes=_DBQL_SUMMARY_DTYPES,
+)
+_REPORT_SPECS = (_TABLESPACE, _DATABASESPACE, _SPOOLSPACE, _DBQL_SUMMARY)
+
+_Q_DBCINFO = text("""
+    SELECT
+        InfoKey,
+        InfoData
+    FROM DBC.DBCInfoV
+    ORDER BY InfoKey;
+    """)
+
+
+@functools.lru_cache(maxsize=1)
+def _yesterday_iso(day_ordinal: int) -> str:
+    """Return yesterday's ISO date; keyed by today's ordinal so it rolls daily."""
+    return date.fromordinal(day_ordinal - 1).isoformat()
+
+
+def _round_date(value: DateLike, round_to: str) -> str:
+    """Render a date bind value as ISO text, truncated to the requested grain.
+
+    Truncating keeps "now"-relative callers on the same Teradata plan cache and
+    result cache entries; 'none' passes the value through unchanged.
+    """
+    if isinstance(value, str):
+        if round_to == "none" or (round_to == "day" and len(value) == 10):
+            return value
+        if round_to == "day":
+            return date.fromisoformat(value[:10]).isoformat()
+        value = datetime.fromisoformat(value)
+    elif round_to == "none":
+        return value.isoformat()
+
+    if round_to == "day":
+        if isinstance(value, datetime):
+            value = value.date()
+        return value.isoformat()
+
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    return value.replace(minute=0, second=0, microsecond=0).isoformat(sep=" ")
+
+
+@functools.lru_cache(maxsize=128)
+def _like_pattern(database_name: str, match_mode: Optional[str]) -> Tuple[str, bool]:
+    """Return the LIKE pattern for a name and whether the legacy default applied.
+
+    Memoized because it is a pure string transform run on every report call;
+    the deprecation warning is left to the caller so it is not cached away.
+    """
+    if match_mode is not None and match_mode not in _MATCH_MODES:
+        raise ValueError(
+            f"Invalid match_mode {match_mode!r}; expected one of {_MATCH_MODES}"
+        )
+
+    name = (database_name or "").strip() or "%"
+    if "%" in name or "_" in name:
+        return name, False
+    if match_mode == "prefix":
+        return f"{name}%", False
+    if match_mode == "contains":
+        return f"%{name}%", False
+    if match_mode == "exact":
+        return name, False
+    return f"%{name}", True
+
+
+def _select_columns(
+    spec: _ReportSpec, columns: Optional[Sequence[str]]
+) -> Tuple[str, ...]:
+    """Validate a caller's column list against the report's whitelist.
+
+    Raises:
+        ValueError: If any column is not part of the report.
+    """
+    if not columns:
+        return spec.columns
+    if isinstance(columns, str):
+        columns = (columns,)
+    selected = tuple(columns)
+    unknown = [column for column in selected if column not in spec.allowed_columns]
+    if unknown:
+        raise ValueError(
+            f"Unknown columns for {spec.name}: {unknown}; "
+            f"expected any of {list(spec.columns)}"
+        )
+    return selected
+
+
+@functools.lru_cache(maxsize=64)
+def _build_query(
+    spec: _ReportSpec,
+    columns: Tuple[str, ...],
+    trim: bool,
+    exact: FrozenSet[str] = frozenset(),
+) -> TextClause:
+    """Render a report's SQL for the given columns, parsed once per combination.
+
+    Bind parameters named in ``exact`` are compared with '=' instead of LIKE.
+    """
+    select_list = ",\n        ".join(
+        _COLUMN_EXPRESSIONS.get(column, column) for column in columns
+    )
+    names = {
+        column: f"TRIM({column})" if trim else column for _, column in spec.filters
+    }
+    operators = {
+        f"{param}_op": "=" if param in exact else "LIKE" for param, _ in spec.filters
+    }
+    return text(spec.sql_template.format(select_list=select_list, **names, **operators))
+
+
+@functools.lru_cache(maxsize=64)
+def _read_kwargs(
+    spec: _ReportSpec, columns: Tuple[str, ...], arrow: bool = False
+) -> Dict[str, Any]:
+    """Return read_sql dtype/parse_dates arguments restricted to ``columns``.
+
+    With the Arrow backend (``arrow=True``) only categorical casts are kept;
+    re-casting the other columns would replace their Arrow dtypes.
+    """
+    if spec.dtypes is None:
+        return {}
+    return {
+        "parse_dates": [column for column in _PARSE_DATES if column in columns],
+        "dtype": {
+            column: dtype
+            for column, dtype in spec.dtypes.items()
+            if column in columns and (not arrow or dtype == "category")
+        },
+    }
+
+
+def _sort_result(spec: _ReportSpec, df: pd.DataFrame) -> pd.DataFrame:
+    """Stable-sort a result by the report's sort columns that were selected."""
+    by = [column for column in spec.sort_columns if column in df.columns]
+    if not by:
+        return df.copy()
+    return df.sort_values(by, kind="mergesort", ignore_index=True)
+
+
+def _arrow_strings(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert text columns and categories back to Arrow strings in place.
+
+    ``read_sql`` with the Arrow backend gives text columns (and the
+    categories of categorical columns) an Arrow string dtype, which a
+    Parquet round trip turns into pandas' own string or object dtype.
+    """
+    string = pd.ArrowDtype(pyarrow.string())
+    for column in df.columns:
+        dtype = df[column].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            categories = dtype.categories.astype(string)
+            df[column] = df[column].astype(
+                pd.CategoricalDtype(categories, dtype.ordered)
+            )
+        elif isinstance(dtype, pd.StringDtype) or dtype == object:
+            df[column] = df[column].astype(string)
+    return df
+
+
+class _TTLCache:
+    """Thread-safe LRU mapping whose entries expire ``ttl`` seconds after insert.
+
+    Args:
+        maxsize: Maximum number of entries kept; least recently used go first.
+        ttl: Entry lifetime in seconds.
+        timer: Monotonic clock, overridable for tests.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        timer: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._timer = timer
+        self._data: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value for key, or None if missing or expired."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= self._timer():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the least recently used entry."""
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (self._timer() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
 
 class PDCRInfoReport:
     """Generates reports from DBC.DBCInfoV table.
@@ -28,6 +515,12 @@ class PDCRInfoReport:
     Args:
         config_path: Optional path to YAML configuration file.
             Defaults to 'td_env.yaml'.
+        use_arrow: Return Arrow-backed columns when pyarrow is installed.
+        cache_ttl: Seconds to keep history results for identical calls.
+        eager_envs: Environments to connect to in the background at startup.
+        disk_cache_dir: Directory for Parquet copies of history results,
+            shared across processes.
+        disk_cache_ttl: Seconds a Parquet copy stays valid.
 
     Example:
         >>> report = PDCRInfoReport()
@@ -35,41 +528,407 @@ class PDCRInfoReport:
         >>> print(df.head())
     """
 
-    def __init__(self, config_path: Optional[str] = None):
+    _DEFAULT_START = "1900-01-01"
+
+    def __init__(
+        self,
+        config_path: Optional[str] = None,
+        use_arrow: bool = True,
+        cache_ttl: float = 300,
+        eager_envs: Optional[Sequence[str]] = None,
+        disk_cache_dir: Optional[Union[str, Path]] = None,
+        disk_cache_ttl: float = 86400,
+    ):
         """Initialize the PDCR info report generator.
 
         Args:
             config_path: Optional path to YAML configuration file.
+            use_arrow: Return Arrow-backed columns when pyarrow is installed.
+                Set to False for classic numpy/object dtypes.
+            cache_ttl: Seconds to keep history results for identical calls.
+                0 disables result caching.
+            eager_envs: Environments to connect to in the background now,
+                so the first report skips the logon.
+            disk_cache_dir: Directory where history results are also saved
+                as Parquet, so repeats survive process restarts. Requires
+                pyarrow. Disabled when None.
+            disk_cache_ttl: Seconds a Parquet copy is reused, judged by its
+                modification time. 0 disables reads from the disk cache.
+
+        Raises:
+            ImportError: If disk_cache_dir is set and pyarrow is missing.
         """
-        self.conn_mgr = TeradataConnection(config_path)
+        self.conn_mgr = TeradataConnection(config_path, eager_envs=eager_envs)
+        self._read_options = _READ_SQL_OPTIONS if use_arrow else {}
+        self._finalizer = weakref.finalize(self, self.conn_mgr.close_all)
+        # Dashboards re-request identical history pulls within seconds.
+        self._result_cache = _TTLCache(maxsize=64, ttl=cache_ttl)
+        # DBC.DBCInfoV only changes on system upgrades.
+        self._dbcinfo_cache: Dict[str, pd.DataFrame] = {}
+
+        self._disk_cache_dir: Optional[Path] = None
+        self._disk_cache_ttl = disk_cache_ttl
+        if disk_cache_dir is not None:
+            if not _HAS_PYARROW:
+                raise ImportError(
+                    "disk_cache_dir requires pyarrow; install "
+                    "'teradata-pdcr-generator[arrow]'"
+                )
+            self._disk_cache_dir = Path(disk_cache_dir)
+            self._disk_cache_dir.mkdir(parents=True, exist_ok=True)
+        # Results from different config files must not share cache files.
+        self._disk_cache_scope = str(self.conn_mgr.config_path.resolve())
 
-    @staticmethod
+    def _iter_batches(
+        self, env_name: str, query: Any, params: Dict[str, Any], **read_kwargs: Any
+    ) -> Iterator[pd.DataFrame]:
+        """Yield query results in batches from a server-side cursor.
+
+        The connection is held until the generator is exhausted or closed.
+        """
+        conn = self.conn_mgr.get_engine(env_name).connect()
+        try:
+            conn = conn.execution_options(stream_results=True, yield_per=_BATCH_SIZE)
+            yield from pd.read_sql(
+                query,
+                con=conn,
+                params=params,
+                chunksize=_BATCH_SIZE,
+                **read_kwargs,
+                **self._read_options,
+            )
+        finally:
+            conn.close()
+
+    def clear_cache(self) -> None:
+        """Discard cached query results so the next calls hit Teradata."""
+        self._result_cache.clear()
+        self._dbcinfo_cache.clear()
+        if self._disk_cache_dir is not None:
+            for spec in _REPORT_SPECS:
+                for path in self._disk_cache_dir.glob(f"{spec.name}-*.parquet"):
+                    path.unlink(missing_ok=True)
+
+    def _disk_cache_path(self, spec: _ReportSpec, key: Tuple[Any, ...]) -> Path:
+        """Return the Parquet file holding the result for a cache key."""
+        assert self._disk_cache_dir is not None
+        digest = hashlib.blake2b(
+            repr((self._disk_cache_scope, bool(self._read_options), key)).encode(),
+            digest_size=16,
+        ).hexdigest()
+        return self._disk_cache_dir / f"{spec.name}-{digest}.parquet"
+
+    def _read_disk_cache(self, path: Path) -> Optional[pd.DataFrame]:
+        """Load a cached result if it exists and is younger than the TTL."""
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        if time.time() - mtime >= self._disk_cache_ttl:
+            return None
+        try:
+            # The pandas metadata in the file restores the original dtypes,
+            # except that Arrow string columns come back as pandas strings.
+            df = pd.read_parquet(path)
+            return _arrow_strings(df) if self._read_options else df
+        except Exception as exc:
+            logger.debug("Ignoring unreadable disk cache %s: %s", path, exc)
+            return None
+
+    def _write_disk_cache(self, path: Path, df: pd.DataFrame) -> None:
+        """Save a result atomically; failures only cost the cache entry."""
+        tmp_path = path.with_name(
+            f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            df.to_parquet(tmp_path, compression="zstd")
+            os.replace(tmp_path, path)
+        except Exception as exc:
+            logger.debug("Could not write disk cache %s: %s", path, exc)
+            tmp_path.unlink(missing_ok=True)
+
+    def _conn(self, env_name: str) -> Connection:
+        """Check out a pooled connection for the environment.
+
+        Handing pandas a Connection rather than the Engine lets it reuse the
+        pooled DBAPI connection instead of opening its own for each query.
+        """
+        return self.conn_mgr.get_engine(env_name).connect()
+
+    @classmethod
     def _normalize_dates(
-        start_date: Optional[DateLike], end_date: Optional[DateLike]
+        cls,
+        start_date: Optional[DateLike],
+        end_date: Optional[DateLike],
+        round_to: str = "day",
     ) -> tuple[str, str]:
-        """Normalize date inputs to ISO strings with sensible defaults."""
-        start = start_date or date(1900, 1, 1)
-        end = end_date or (date.today() - timedelta(days=1))
+        """Normalize date inputs to ISO strings with sensible defaults.
 
-        if isinstance(start, str):
-            start_value = start
-        else:
-            start_value = start.isoformat()
+        Args:
+            start_date: Start date, datetime or ISO string; 1900-01-01 if empty.
+            end_date: End date, datetime or ISO string; yesterday if empty.
+            round_to: Truncate values to 'day' (the LogDate grain), 'hour',
+                or 'none' to pass them through as given.
 
-        if isinstance(end, str):
-            end_value = end
-        else:
-            end_value = end.isoformat()
+        Raises:
+            ValueError: If round_to is not a known grain or a string is not
+                an ISO date.
+        """
+        if round_to not in _ROUND_TO:
+            raise ValueError(
+                f"Invalid round_to {round_to!r}; expected one of {_ROUND_TO}"
+            )
 
+        start_value = (
+            _round_date(start_date, round_to) if start_date else cls._DEFAULT_START
+        )
+        end_value = (
+            _round_date(end_date, round_to)
+            if end_date
+            else _yesterday_iso(date.today().toordinal())
+        )
         return start_value, end_value
 
     @staticmethod
-    def _database_filter(database_name: str) -> str:
-        """Build a LIKE filter, honoring existing wildcards if provided."""
-        name = database_name.strip() if database_name else "%"
-        if "%" in name or "_" in name:
-            return name
-        return f"%{name}"
+    def _database_filter(database_name: str, match_mode: Optional[str] = None) -> str:
+        """Build a LIKE filter, honoring existing wildcards if provided.
+
+        Args:
+            database_name: Name or LIKE pattern. Patterns containing '%' or
+                '_' are returned unchanged.
+            match_mode: How a bare name is matched: 'prefix' ('name%'),
+                'contains' ('%name%') or 'exact' (the name itself, which
+                callers compare with '='). None keeps the legacy leading
+                wildcard ('%name'; '%name%' once the untrimmed pad '%' is
+                added), which finds the name anywhere, cannot use index
+                range scans and is deprecated in favour of 'prefix'.
+
+        Raises:
+            ValueError: If match_mode is not a known mode.
+        """
+        pattern, legacy = _like_pattern(database_name, match_mode)
+        if legacy:
+            warnings.warn(
+                "Matching bare names anywhere in the name (a leading wildcard, "
+                "'%name%' on untrimmed columns) is deprecated; pass "
+                "match_mode='prefix' (the future default), 'contains' or 'exact'",
+                FutureWarning,
+                stacklevel=5,
+            )
+        return pattern
+
+    @staticmethod
+    def _untrimmed_filter(pattern: str) -> str:
+        """Append a trailing wildcard so padded values match without TRIM()."""
+        return pattern if pattern.endswith("%") else f"{pattern}%"
+
+    def _filter_patterns(
+        self,
+        spec: _ReportSpec,
+        trim: bool,
+        match_mode: Optional[str],
+        filters: Dict[str, str],
+    ) -> Tuple[Dict[str, str], FrozenSet[str]]:
+        """Return the bind value for each filter and the ones compared with '='.
+
+        Bare names in 'exact' mode are compared with '=', which ignores the
+        trailing pad on the CHAR columns. Every other pattern uses LIKE, and
+        without TRIM() gets a trailing '%' to absorb that pad.
+        """
+        patterns: Dict[str, str] = {}
+        exact = []
+        for param, _ in spec.filters:
+            pattern = self._database_filter(filters[param], match_mode)
+            if match_mode == "exact" and "%" not in pattern and "_" not in pattern:
+                exact.append(param)
+            elif not trim:
+                pattern = self._untrimmed_filter(pattern)
+            patterns[param] = pattern
+        return patterns, frozenset(exact)
+
+    def _cached_result(
+        self, spec: _ReportSpec, env_name: str, cache_key: Tuple[Any, ...]
+    ) -> Optional[pd.DataFrame]:
+        """Return a cached result from memory, then from the disk cache."""
+        cached = self._result_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Using cached %s history for %s", spec.label, env_name)
+            return cached
+        if self._disk_cache_dir is None:
+            return None
+
+        cached = self._read_disk_cache(self._disk_cache_path(spec, cache_key))
+        if cached is not None:
+            logger.debug("Using disk-cached %s history for %s", spec.label, env_name)
+            self._result_cache.set(cache_key, cached)
+        return cached
+
+    def _store_result(
+        self, spec: _ReportSpec, cache_key: Tuple[Any, ...], df: pd.DataFrame
+    ) -> None:
+        """Cache a fresh result in memory and, if enabled, on disk."""
+        self._result_cache.set(cache_key, df)
+        if self._disk_cache_dir is not None:
+            self._write_disk_cache(self._disk_cache_path(spec, cache_key), df)
+
+    def _timed_read(
+        self,
+        spec: _ReportSpec,
+        env_name: str,
+        query: TextClause,
+        params: Dict[str, str],
+        read_kwargs: Dict[str, Any],
+        clock: Callable[[], float],
+    ) -> pd.DataFrame:
+        """Run a report query, warning when it takes longer than 5 seconds."""
+        with self._conn(env_name) as conn:
+            logger.debug("Query parameters: %s", params)
+            start_ts = clock()
+            try:
+                df = pd.read_sql(
+                    query,
+                    con=conn,
+                    params=params,
+                    **read_kwargs,
+                    **self._read_options,
+                )
+            except Exception as exc:  # pragma: no cover - safety net
+                logger.error(
+                    "Failed %s query env=%s params=%s error=%s",
+                    spec.label,
+                    env_name,
+                    params,
+                    exc,
+                )
+                raise
+            duration = clock() - start_ts
+
+        if duration > 5:
+            logger.warning(
+                "Slow %s query env=%s duration=%.3fs",
+                spec.label,
+                env_name,
+                duration,
+            )
+        else:
+            logger.debug(
+                "%s query duration env=%s duration=%.3fs",
+                spec.label,
+                env_name,
+                duration,
+            )
+        return df
+
+    def _run_history(
+        self,
+        spec: _ReportSpec,
+        env_name: str,
+        start_date: Optional[DateLike],
+        end_date: Optional[DateLike],
+        trim: bool,
+        match_mode: Optional[str],
+        iter_batches: bool,
+        columns: Optional[Sequence[str]],
+        sort: bool,
+        _clock: Callable[[], float] = time.perf_counter,
+        **filters: str,
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+        """Run a history report described by ``spec``.
+
+        Args:
+            spec: Report to run.
+            env_name: Environment name (e.g., 'test', 'prod').
+            start_date: Inclusive start date; defaults to 1900-01-01 when None.
+            end_date: Inclusive end date; defaults to yesterday when None.
+            trim: Apply TRIM() to the filter columns and match patterns as given.
+            match_mode: How bare names are matched; see ``_database_filter``.
+            iter_batches: Stream the result as an iterator of DataFrames.
+            columns: Subset of the result columns to select.
+            sort: Order the result by ``spec.sort_columns`` on the client.
+            _clock: Timer used to measure the query for the slow-query warning.
+            **filters: One LIKE pattern per bind parameter in ``spec.filters``.
+
+        Returns:
+            DataFrame, or an iterator of DataFrames when iter_batches is set.
+
+        Raises:
+            ValueError: If sort and iter_batches are both requested.
+        """
+        if sort and iter_batches:
+            raise ValueError("sort=True cannot be combined with iter_batches=True")
+
+        start_value, end_value = self._normalize_dates(start_date, end_date)
+        patterns, exact = self._filter_patterns(spec, trim, match_mode, filters)
+        params = {"start_date": start_value, "end_date": end_value, **patterns}
+
+        selected = _select_columns(spec, columns)
+        query = _build_query(spec, selected, trim, exact)
+        read_kwargs = _read_kwargs(spec, selected, bool(self._read_options))
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Query Text: %s", query)
+
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Fetching %s history for %s between %s and %s",
+                spec.label,
+                env_name,
+                start_value,
+                end_value,
+            )
+
+        if iter_batches:
+            return self._iter_batches(env_name, query, params, **read_kwargs)
+
+        cache_key = (env_name, spec.name, trim, selected, exact, *params.values())
+        df = self._cached_result(spec, env_name, cache_key)
+        if df is None:
+            df = self._timed_read(spec, env_name, query, params, read_kwargs, _clock)
+            self._store_result(spec, cache_key, df)
+        return _sort_result(spec, df) if sort else df.copy()
+
+    @overload
+    def get_tablespace_history(
+        self,
+        env_name: str,
+        start_date: Optional[DateLike] = ...,
+        end_date: Optional[DateLike] = ...,
+        database_name: str = ...,
+        trim: bool = ...,
+        match_mode: Optional[str] = ...,
+        iter_batches: Literal[False] = ...,
+        columns: Optional[Sequence[str]] = ...,
+        sort: bool = ...,
+    ) -> pd.DataFrame: ...
+
+    @overload
+    def get_tablespace_history(
+        self,
+        env_name: str,
+        start_date: Optional[DateLike] = ...,
+        end_date: Optional[DateLike] = ...,
+        database_name: str = ...,
+        trim: bool = ...,
+        match_mode: Optional[str] = ...,
+        *,
+        iter_batches: Literal[True],
+        columns: Optional[Sequence[str]] = ...,
+        sort: bool = ...,
+    ) -> Iterator[pd.DataFrame]: ...
+
+    @overload
+    def get_tablespace_history(
+        self,
+        env_name: str,
+        start_date: Optional[DateLike] = ...,
+        end_date: Optional[DateLike] = ...,
+        database_name: str = ...,
+        trim: bool = ...,
+        match_mode: Optional[str] = ...,
+        iter_batches: bool = ...,
+        columns: Optional[Sequence[str]] = ...,
+        sort: bool = ...,
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]: ...
 
     def get_tablespace_history(
         self,
@@ -77,14 +936,34 @@ class PDCRInfoReport:
         start_date: Optional[DateLike] = None,
         end_date: Optional[DateLike] = None,
         database_name: str = "%",
-    ) -> pd.DataFrame:
+        trim: bool = False,
+        match_mode: Optional[str] = None,
+        iter_batches: bool = False,
+        columns: Optional[Sequence[str]] = None,
+        sort: bool = False,
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
         """Retrieve TableSpace history from PDCRINFO.TableSpace_Hst.
 
         Args:
             env_name: Environment name (e.g., 'test', 'prod').
             start_date: Inclusive start date; defaults to 1900-01-01 when None.
             end_date: Inclusive end date; defaults to yesterday when None.
-            database_name: Database name pattern; '%' by default.
+            database_name: Database name pattern; '%' by default. The
+                pattern is matched against the raw column with a trailing
+                '%' appended to absorb the column's blank padding.
+            trim: Apply TRIM() to DatabaseName and match the pattern as
+                given. Slower, since it defeats statistics on the column.
+            match_mode: How bare names are matched: 'prefix', 'contains' or
+                'exact' (compared with '='). Defaults to the deprecated
+                legacy match, which finds the name anywhere ('%name%', or
+                '%name' with trim).
+            iter_batches: Stream the result over a server-side cursor as an
+                iterator of DataFrames of up to 50,000 rows. Batches are not
+                cached.
+            columns: Subset of the result columns to select, in order;
+                all columns when None.
+            sort: Sort rows by LogDate, DatabaseName and Tablename on the
+                client. Otherwise rows come back in server order, unsorted.
 
         Returns:
             DataFrame with LogDate, DatabaseName, Tablename, AccountName,
@@ -94,73 +973,61 @@ class PDCRInfoReport:
             >>> report = PDCRInfoReport()
             >>> df = report.get_tablespace_history('prod', '2024-01-01', '2024-01-31')
         """
-
-        start_value, end_value = self._normalize_dates(start_date, end_date)
-        db_filter = self._database_filter(database_name)
-
-        query = """
-        SELECT
-            LogDate,
-            DatabaseName,
-            Tablename,
-            AccountName,
-            CURRENTPERM,
-            PEAKPERM,
-            CURRENTPERMSKEW,
-            PEAKPERMSKEW
-        FROM PDCRINFO.TableSpace_Hst
-        WHERE Logdate BETWEEN :start_date AND :end_date
-          AND TRIM(DatabaseName) LIKE :database_name
-        ORDER BY 1, 2, 3;
-        """
-
-        logger.info(
-            "Query Text: %s", query
-        )
-
-
-
-        logger.info(
-            "Fetching TableSpace history for %s between %s and %s",
+        return self._run_history(
+            _TABLESPACE,
             env_name,
-            start_value,
-            end_value,
+            start_date,
+            end_date,
+            trim,
+            match_mode,
+            iter_batches,
+            columns,
+            sort,
+            database_name=database_name,
         )
 
-        with self.conn_mgr.get_connection(env_name) as engine:
-            sql_text = text(query)
-            params = {
-                "start_date": start_value,
-                "end_date": end_value,
-                "database_name": db_filter,
-            }
-            logger.debug(f"Query parameters: {params}")
-            start_ts = time.perf_counter()
-            try:
-                df = pd.read_sql(sql_text, engine, params=params)
-            except Exception as exc:  # pragma: no cover - safety net
-                logger.error(
-                    "Failed TableSpace query env=%s start=%s end=%s filter=%s error=%s",
-                    env_name,
-                    start_value,
-                    end_value,
-                    db_filter,
-                    exc,
-                )
-                raise
-
-            duration = time.perf_counter() - start_ts
-            if duration > 5:
-                logger.warning(
-                    "Slow TableSpace query env=%s duration=%.3fs", env_name, duration
-                )
-            else:
-                logger.debug(
-                    "TableSpace query duration env=%s duration=%.3fs",
-                    env_name,
-                    duration,
-                )
-            return df
+    @overload
+    def get_databasespace_history(
+        self,
+        env_name: str,
+        start_date: Optional[DateLike] = ...,
+        end_date: Optional[DateLike] = ...,
+        database_name: str = ...,
+        trim: bool = ...,
+        match_mode: Optional[str] = ...,
+        iter_batches: Literal[False] = ...,
+        columns: Optional[Sequence[str]] = ...,
+        sort: bool = ...,
+    ) -> pd.DataFrame: ...
+
+    @overload
+    def get_databasespace_history(
+        self,
+        env_name: str,
+        start_date: Optional[DateLike] = ...,
+        end_date: Optional[DateLike] = ...,
+        database_name: str = ...,
+        trim: bool = ...,
+        match_mode: Optional[str] = ...,
+        *,
+        iter_batches: Literal[True],
+        columns: Optional[Sequence[str]] = ...,
+        sort: bool = ...,
+    ) -> Iterator[pd.DataFrame]: ...
+
+    @overload
+    def get_databasespace_history(
+        self,
+        env_name: str,
+        start_date: Optional[DateLike] = ...,
+        end_date: Optional[DateLike] = ...,
+        database_name: str = ...,
+        trim: bool = ...,
+        match_mode: Optional[str] = ...,
+        iter_batches: bool = ...,
+        columns: Optional[Sequence[str]] = ...,
+        sort: bool = ...,
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]: ...
 
     def get_databasespace_history(
         self,
@@ -168,14 +1035,34 @@ class PDCRInfoReport:
         start_date: Optional[DateLike] = None,
         end_date: Optional[DateLike] = None,
         database_name: str = "%",
-    ) -> pd.DataFrame:
+        trim: bool = False,
+        match_mode: Optional[str] = None,
+        iter_batches: bool = False,
+        columns: Optional[Sequence[str]] = None,
+        sort: bool = False,
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
         """Retrieve DatabaseSpace history from PDCRINFO.DatabaseSpace_Hst.
 
         Args:
             env_name: Environment name (e.g., 'test', 'prod').
             start_date: Inclusive start date; defaults to 1900-01-01 when None.
             end_date: Inclusive end date; defaults to yesterday when None.
-            database_name: Database name pattern; '%' by default.
+            database_name: Database name pattern; '%' by default. The
+                pattern is matched against the raw column with a trailing
+                '%' appended to absorb the column's blank padding.
+            trim: Apply TRIM() to DatabaseName and match the pattern as
+                given. Slower, since it defeats statistics on the column.
+            match_mode: How bare names are matched: 'prefix', 'contains' or
+                'exact' (compared with '='). Defaults to the deprecated
+                legacy match, which finds the name anywhere ('%name%', or
+                '%name' with trim).
+            iter_batches: Stream the result over a server-side cursor as an
+                iterator of DataFrames of up to 50,000 rows. Batches are not
+                cached.
+            columns: Subset of the result columns to select, in order;
+                all columns when None.
+            sort: Sort rows by LogDate, DatabaseName and AccountName on the
+                client. Otherwise rows come back in server order, unsorted.
 
         Returns:
             DataFrame with LogDate, DatabaseName, AccountName, CURRENTPERM,
@@ -185,72 +1072,64 @@ class PDCRInfoReport:
             >>> report = PDCRInfoReport()
             >>> df = report.get_databasespace_history('prod', database_name='Sales%')
         """
-
-        start_value, end_value = self._normalize_dates(start_date, end_date)
-        db_filter = self._database_filter(database_name)
-
-        query = """
-        SELECT
-            LogDate,
-            DatabaseName,
-            AccountName,
-            CURRENTPERM,
-            PEAKPERM,
-            MAXPERM,
-            CURRENTPERMSKEW,
-            PERMPCTUSED
-        FROM PDCRINFO.DatabaseSpace_Hst
-        WHERE Logdate BETWEEN :start_date AND :end_date
-          AND TRIM(DatabaseName) LIKE :database_name
-        ORDER BY 1, 2, 3;
-        """
-        #print(query)
-        logger.info(
-            "Query Text: %s", query
-        )
-
-
-        logger.info(
-            "Fetching DatabaseSpace history for %s between %s and %s",
+        return self._run_history(
+            _DATABASESPACE,
             env_name,
-            start_value,
-            end_value,
+            start_date,
+            end_date,
+            trim,
+            match_mode,
+            iter_batches,
+            columns,
+            sort,
+            database_name=database_name,
         )
 
-        with self.conn_mgr.get_connection(env_name) as engine:
-            sql_text = text(query)
-            params = {
-                "start_date": start_value,
-                "end_date": end_value,
-                "database_name": db_filter,
-            }
-            logger.debug(f"Query parameters: {params}")
-            start_ts = time.perf_counter()
-            try:
-                df = pd.read_sql(sql_text, engine, params=params)
-            except Exception as exc:  # pragma: no cover - safety net
-                logger.error(
-                    "Failed DatabaseSpace query env=%s start=%s end=%s filter=%s error=%s",
-                    env_name,
-                    start_value,
-                    end_value,
-                    db_filter,
-                    exc,
-                )
-                raise
-
-            duration = time.perf_counter() - start_ts
-            if duration > 5:
-                logger.warning(
-                    "Slow DatabaseSpace query env=%s duration=%.3fs", env_name, duration
-                )
-            else:
-                logger.debug(
-                    "DatabaseSpace query duration env=%s duration=%.3fs",
-                    env_name,
-                    duration,
-                )
-            return df
+    @overload
+    def get_spoolspace_history(
+        self,
+        env_name: str,
+        start_date: Optional[DateLike] = ...,
+        end_date: Optional[DateLike] = ...,
+        user_name: str = ...,
+        account_name: str = ...,
+        trim: bool = ...,
+        match_mode: Optional[str] = ...,
+        iter_batches: Literal[False] = ...,
+        columns: Optional[Sequence[str]] = ...,
+        sort: bool = ...,
+    ) -> pd.DataFrame: ...
+
+    @overload
+    def get_spoolspace_history(
+        self,
+        env_name: str,
+        start_date: Optional[DateLike] = ...,
+        end_date: Optional[DateLike] = ...,
+        user_name: str = ...,
+        account_name: str = ...,
+        trim: bool = ...,
+        match_mode: Optional[str] = ...,
+        *,
+        iter_batches: Literal[True],
+        columns: Optional[Sequence[str]] = ...,
+        sort: bool = ...,
+    ) -> Iterator[pd.DataFrame]: ...
+
+    @overload
+    def get_spoolspace_history(
+        self,
+        env_name: str,
+        start_date: Optional[DateLike] = ...,
+        end_date: Optional[DateLike] = ...,
+        user_name: str = ...,
+        account_name: str = ...,
+        trim: bool = ...,
+        match_mode: Optional[str] = ...,
+        iter_batches: bool = ...,
+        columns: Optional[Sequence[str]] = ...,
+        sort: bool = ...,
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]: ...
 
     def get_spoolspace_history(
         self,
@@ -259,16 +1138,36 @@ class PDCRInfoReport:
         end_date: Optional[DateLike] = None,
         user_name: str = "%",
         account_name: str = "%",
-    ) -> pd.DataFrame:
+        trim: bool = False,
+        match_mode: Optional[str] = None,
+        iter_batches: bool = False,
+        columns: Optional[Sequence[str]] = None,
+        sort: bool = False,
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
         """Retrieve SpoolSpace history from PDCRINFO.SpoolSpace_Hst.
 
         Args:
             env_name: Environment name (e.g., 'test', 'prod').
             start_date: Inclusive start date; defaults to 1900-01-01 when None.
             end_date: Inclusive end date; defaults to yesterday when None.
-            user_name: User name pattern; '%' by default.
-            account_name: Account name pattern; '%' by default.
-
+            user_name: User name pattern; '%' by default. Matched against
+                the raw column with a trailing '%' appended to absorb the
+                column's blank padding.
+            account_name: Account name pattern; '%' by default, matched
+                like user_name.
+            trim: Apply TRIM() to UserName and AccountName and match the
+                patterns as given. Slower, since it defeats statistics.
+            match_mode: How bare names are matched: 'prefix', 'contains' or
+                'exact' (compared with '='). Defaults to the deprecated
+                legacy match, which finds the name anywhere ('%name%', or
+                '%name' with trim).
+            iter_batches: Stream the result over a server-side cursor as an
+                iterator of DataFrames of up to 50,000 rows. Batches are not
+                cached.
+            columns: Subset of the result columns to select, in order;
+                all columns when None.
+            sort: Sort rows by LogDate, UserName and AccountName on the
+                client. Otherwise rows come back in server order, unsorted.
 
         Returns:
             DataFrame with LogDate, UserName, AccountName, CURRENTSPOOL,
@@ -278,69 +1177,67 @@ class PDCRInfoReport:
             >>> report = PDCRInfoReport()
             >>> df = report.get_spoolspace_history('prod', user_name='Sales%')
         """
-
-        start_value, end_value = self._normalize_dates(start_date, end_date)
-        user_filter = self._database_filter(user_name)
-        account_filter = self._database_filter(account_name)
-
-        query = """
-        SELECT
-            LogDate, UserName, AccountName, CURRENTSPOOL, PEAKSPOOL,
-		MAXSPOOL, PEAKSPOOLSKEW, CURRENTTEMP, PEAKTEMP, MAXTEMP, PEAKTEMPSKEW
-        FROM PDCRINFO.SpoolSpace_Hst
-        WHERE Logdate BETWEEN :start_date AND :end_date
-          AND TRIM(UserName) LIKE :user_name
-          AND TRIM(AccountName) LIKE :account_name
-        ORDER BY 1, 2, 3;
-        """
-
-        logger.info(
-            "Query Text: %s", query
-        )
-
-        logger.info(
-            "Fetching SpoolSpace history for %s between %s and %s",
+        return self._run_history(
+            _SPOOLSPACE,
             env_name,
-            start_value,
-            end_value,
+            start_date,
+            end_date,
+            trim,
+            match_mode,
+            iter_batches,
+            columns,
+            sort,
+            user_name=user_name,
+            account_name=account_name,
         )
 
-        with self.conn_mgr.get_connection(env_name) as engine:
-            sql_text = text(query)
-            params = {
-                "start_date": start_value,
-                "end_date": end_value,
-                "user_name": user_filter,
-                "account_name": account_filter,
-            }
-            logger.debug(f"Query parameters: {params}")
-            start_ts = time.perf_counter()
-            try:
-                df = pd.read_sql(sql_text, engine, params=params)
-            except Exception as exc:  # pragma: no cover - safety net
-                logger.error(
-                    "Failed SpoolSpace query env=%s start=%s end=%s user=%s account=%s error=%s",
-                    env_name,
-                    start_value,
-                    end_value,
-                    user_filter,
-                    account_filter,
-                    exc,
-                )
-                raise
-
-            duration = time.perf_counter() - start_ts
-            if duration > 5:
-                logger.warning(
-                    "Slow SpoolSpace query env=%s duration=%.3fs", env_name, duration
-                )
-            else:
-                logger.debug(
-                    "SpoolSpace query duration env=%s duration=%.3fs",
-                    env_name,
-                    duration,
-                )
-            return df
+    @overload
+    def get_DBQLSummaryTable_History(
+        self,
+        env_name: str,
+        start_date: Optional[DateLike] = ...,
+        end_date: Optional[DateLike] = ...,
+        user_name: str = ...,
+        trim: bool = ...,
+        match_mode: Optional[str] = ...,
+        iter_batches: Literal[False] = ...,
+        columns: Optional[Sequence[str]] = ...,
+        sort: bool = ...,
+        *,
+        _clock: Callable[[], float] = ...,
+    ) -> pd.DataFrame: ...
+
+    @overload
+    def get_DBQLSummaryTable_History(
+        self,
+        env_name: str,
+        start_date: Optional[DateLike] = ...,
+        end_date: Optional[DateLike] = ...,
+        user_name: str = ...,
+        trim: bool = ...,
+        match_mode: Optional[str] = ...,
+        *,
+        iter_batches: Literal[True],
+        columns: Optional[Sequence[str]] = ...,
+        sort: bool = ...,
+        _clock: Callable[[], float] = ...,
+    ) -> Iterator[pd.DataFrame]: ...
+
+    @overload
+    def get_DBQLSummaryTable_History(
+        self,
+        env_name: str,
+        start_date: Optional[DateLike] = ...,
+        end_date: Optional[DateLike] = ...,
+        user_name: str = ...,
+        trim: bool = ...,
+        match_mode: Optional[str] = ...,
+        iter_batches: bool = ...,
+        columns: Optional[Sequence[str]] = ...,
+        sort: bool = ...,
+        *,
+        _clock: Callable[[], float] = ...,
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]: ...
 
     def get_DBQLSummaryTable_History(
         self,
@@ -348,7 +1245,14 @@ class PDCRInfoReport:
         start_date: Optional[DateLike] = None,
         end_date: Optional[DateLike] = None,
         user_name: str = "%",
-    ) -> pd.DataFrame:
+        trim: bool = False,
+        match_mode: Optional[str] = None,
+        iter_batches: bool = False,
+        columns: Optional[Sequence[str]] = None,
+        sort: bool = False,
+        *,
+        _clock: Callable[[], float] = time.perf_counter,
+    ) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
         """Retrieve DBQL Summary Table History from PDCRINFO.DBQLSummaryTbl_Hst.
 
         Query Log Summary Table History - provides aggregated query performance
@@ -357,8 +1261,24 @@ class PDCRInfoReport:
         Args:
             env_name: Environment name (e.g., 'test', 'prod').
             start_date: Inclusive start date; defaults to 1900-01-01 when None.
-            end_date: Inclusive end date; defaults to 2999-01-01 when None.
-            user_name: User name pattern; '%' by default.
+            end_date: Inclusive end date; defaults to yesterday when None.
+            user_name: User name pattern; '%' by default. Matched against
+                the raw column with a trailing '%' appended to absorb the
+                column's blank padding.
+            trim: Apply TRIM() to UserName and match the pattern as given.
+                Slower, since it defeats statistics on the column.
+            match_mode: How bare names are matched: 'prefix', 'contains' or
+                'exact' (compared with '='). Defaults to the deprecated
+                legacy match, which finds the name anywhere ('%name%', or
+                '%name' with trim).
+            iter_batches: Stream the result over a server-side cursor as an
+                iterator of DataFrames of up to 50,000 rows. Batches are not
+                cached.
+            columns: Subset of the result columns to select, in order;
+                all columns when None.
+            sort: Sort rows by LogDate and UserName on the client.
+                Otherwise rows come back in server order, unsorted.
+            _clock: Timer for the slow-query warning; tests pass a fake.
 
         Returns:
             DataFrame with LogDate, ProcID, CollectTimeStamp, UserID, ZoneID,
@@ -373,71 +1293,185 @@ class PDCRInfoReport:
             >>> report = PDCRInfoReport()
             >>> df = report.get_DBQLSummaryTable_History('prod', user_name='ETL%')
         """
-
-        start_value, end_value = self._normalize_dates(start_date, end_date)
-        user_filter = self._database_filter(user_name)
-
-        query = """
-        SELECT
-            LogDate, ProcID, CollectTimeStamp, UserID, ZoneID, UserName,
-            AcctString, LogicalHostID, AppID, ClientID, ClientAddr, ProfileID,
-            SessionID, QueryCount, ValueType, QuerySeconds, TotalIOCount,
-            AMPCPUTime, ParserCPUTime, AMPCPUTimeNorm, ParserCPUTimeNorm,
-            LowHist, HighHist, UsedIota, ReqPhysIO, ReqPhysIOKB, StartTime,
-            StopTime, ProfileName, ExtraField1 AS TotalIOInKB, ExtraField2,
-            ExtraField3, ExtraField4, ExtraField5, ExtraField6, ExtraField7,
-            ExtraField8, ExtraField9
-        FROM PDCRINFO.DBQLSummaryTbl_Hst
-        WHERE LogDate BETWEEN :start_date AND :end_date
-          AND TRIM(UserName) LIKE :user_name
-        ORDER BY LogDate, UserName;
-        """
-
-        logger.info(
-            "Fetching DBQL Summary Table History for %s between %s and %s",
+        return self._run_history(
+            _DBQL_SUMMARY,
             env_name,
-            start_value,
-            end_value,
+            start_date,
+            end_date,
+            trim,
+            match_mode,
+            iter_batches,
+            columns,
+            sort,
+            _clock=_clock,
+            user_name=user_name,
         )
 
-        with self.conn_mgr.get_connection(env_name) as engine:
-            sql_text = text(query)
-            params = {
-                "start_date": start_value,
-                "end_date": end_value,
-                "user_name": user_filter,
-            }
-            logger.debug(f"Query parameters: {params}")
-            start_ts = time.perf_counter()
-            try:
-                df = pd.read_sql(sql_text, engine, params=params)
-            except Exception as exc:  # pragma: no cover - safety net
-                logger.error(
-                    "Failed DBQL Summary query env=%s start=%s end=%s user=%s error=%s",
+    def get_all_space_history(
+        self,
+        env_name: str,
+        start_date: Optional[DateLike] = None,
+        end_date: Optional[DateLike] = None,
+        database_name: str = "%",
+        user_name: str = "%",
+        account_name: str = "%",
+        trim: bool = False,
+        match_mode: Optional[str] = None,
+        sort: bool = False,
+    ) -> Dict[str, pd.DataFrame]:
+        """Retrieve TableSpace, DatabaseSpace and SpoolSpace history at once.
+
+        The three queries run concurrently on separate pooled connections, so
+        the call costs roughly one round-trip of wall-clock time instead of
+        three.
+
+        Args:
+            env_name: Environment name (e.g., 'test', 'prod').
+            start_date: Inclusive start date; defaults to 1900-01-01 when None.
+            end_date: Inclusive end date; defaults to yesterday when None.
+            database_name: Database name pattern for table and database space.
+            user_name: User name pattern for spool space.
+            account_name: Account name pattern for spool space.
+            trim: Apply TRIM() to the name columns, as in the individual
+                methods.
+            match_mode: How bare names are matched, as in the individual
+                methods.
+            sort: Sort each result client-side, as in the individual methods.
+
+        Returns:
+            Dict with 'tablespace', 'databasespace' and 'spoolspace'
+            DataFrames, as returned by the individual history methods.
+
+        Example:
+            >>> report = PDCRInfoReport()
+            >>> frames = report.get_all_space_history('prod', '2024-01-01')
+            >>> frames['spoolspace'].head()
+        """
+        # Create the engine up front so the workers share one pool.
+        self.conn_mgr.get_engine(env_name)
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = {
+                "tablespace": executor.submit(
+                    self.get_tablespace_history,
                     env_name,
-                    start_value,
-                    end_value,
-                    user_filter,
-                    exc,
-                )
-                raise
+                    start_date,
+                    end_date,
+                    database_name,
+                    trim,
+                    match_mode=match_mode,
+                    sort=sort,
+                ),
+                "databasespace": executor.submit(
+                    self.get_databasespace_history,
+                    env_name,
+                    start_date,
+                    end_date,
+                    database_name,
+                    trim,
+                    match_mode=match_mode,
+                    sort=sort,
+                ),
+                "spoolspace": executor.submit(
+                    self.get_spoolspace_history,
+                    env_name,
+                    start_date,
+                    end_date,
+                    user_name,
+                    account_name,
+                    trim,
+                    match_mode=match_mode,
+                    sort=sort,
+                ),
+            }
+            return {name: future.result() for name, future in futures.items()}
 
-            duration = time.perf_counter() - start_ts
-            if duration > 5:
-                logger.warning(
-                    "Slow DBQL Summary query env=%s duration=%.3fs", env_name, duration
-                )
-            else:
-                logger.debug(
-                    "DBQL Summary query duration env=%s duration=%.3fs",
+    def get_tablespace_history_multi(
+        self,
+        env_name: str,
+        date_ranges: Sequence[Tuple[Optional[DateLike], Optional[DateLike]]],
+        database_patterns: Sequence[str] = ("%",),
+        trim: bool = False,
+        match_mode: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+        sort: bool = False,
+    ) -> pd.DataFrame:
+        """Retrieve TableSpace history for several date ranges and patterns.
+
+        One query per (date range, pattern) combination runs concurrently on
+        the environment's pool, with as many workers as the pool holds
+        connections. Results are cached like single calls.
+
+        Args:
+            env_name: Environment name (e.g., 'test', 'prod').
+            date_ranges: (start_date, end_date) pairs, as accepted by
+                ``get_tablespace_history``.
+            database_patterns: Database name patterns; overlapping patterns
+                return overlapping rows.
+            trim: Apply TRIM() to DatabaseName, as in the single method.
+            match_mode: How bare names are matched, as in the single method.
+            columns: Subset of the result columns to select.
+            sort: Sort the combined result as ``get_tablespace_history`` does.
+
+        Returns:
+            All results concatenated in submission order (or sorted), with a
+            fresh index.
+
+        Example:
+            >>> report = PDCRInfoReport()
+            >>> df = report.get_tablespace_history_multi(
+            ...     'prod',
+            ...     [('2024-01-01', '2024-01-31'), ('2024-02-01', '2024-02-29')],
+            ...     ['Sales%', 'Finance%'],
+            ... )
+        """
+        tasks = [
+            (start_date, end_date, pattern)
+            for start_date, end_date in date_ranges
+            for pattern in database_patterns
+        ]
+        if not tasks:
+            return pd.DataFrame(columns=list(_select_columns(_TABLESPACE, columns)))
+
+        # One engine for every worker, sized so no task waits on the pool.
+        engine = self.conn_mgr.get_engine(env_name)
+        pool_size = getattr(engine.pool, "size", None)
+        workers = pool_size() if callable(pool_size) else _POOL_WORKERS
+        workers = max(1, min(workers, len(tasks)))
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    self.get_tablespace_history,
                     env_name,
-                    duration,
+                    start_date,
+                    end_date,
+                    pattern,
+                    trim,
+                    match_mode=match_mode,
+                    columns=columns,
                 )
-            return df
+                for start_date, end_date, pattern in tasks
+            ]
+            frames = [future.result() for future in futures]
+
+        df = pd.concat(frames, ignore_index=True)
+        # concat falls back to object when category sets differ between parts.
+        categories = {
+            column: "category"
+            for column, dtype in _TABLESPACE_DTYPES.items()
+            if dtype == "category" and column in df.columns
+        }
+        if categories:
+            df = df.astype(categories)
+        return _sort_result(_TABLESPACE, df) if sort else df
 
     def get_dbcinfo(self, env_name: str) -> pd.DataFrame:
         """Retrieve PDCR info data from DBC.DBCInfoV.
 
+        The result is kept per environment until ``clear_cache`` or
+        ``close`` is called, since it only changes on system upgrades.
+
         Args:
             env_name: Environment name (e.g., 'test', 'prod').
 
@@ -453,26 +1487,29 @@ class PDCRInfoReport:
             >>> info_keys = df['InfoKey'].unique()
         """
 
-        query = """
-        SELECT
-            InfoKey,
-            InfoData
-        FROM DBC.DBCInfoV
-        ORDER BY InfoKey;
-        """
+        cached = self._dbcinfo_cache.get(env_name)
+        if cached is not None:
+            return cached.copy()
+
+        query = _Q_DBCINFO
 
-        logger.info(f"Executing PDCR info query on '{env_name}' environment")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Executing PDCR info query on '%s' environment", env_name)
 
         try:
-            with self.conn_mgr.get_connection(env_name) as engine:
-                df = pd.read_sql(query, engine)
-                logger.info(f"Retrieved {len(df)} rows from DBC.DBCInfoV")
-                return df
+            with self._conn(env_name) as conn:
+                df = pd.read_sql(query, con=conn, **self._read_options)
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Retrieved %d rows from DBC.DBCInfoV", len(df))
+                self._dbcinfo_cache[env_name] = df
+                return df.copy()
 
         except Exception as e:
-            logger.error(f"Failed to retrieve PDCR info data: {e}")
+            logger.error("Failed to retrieve PDCR info data: %s", e)
             raise
 
     def close(self) -> None:
         """Close all database connections."""
         self.conn_mgr.close_all()
+        self._dbcinfo_cache.clear()
+        self._finalizer.detach()
@@ -1 +0,0 @@
-"""Tests for Teradata PDCR Report Generator"""
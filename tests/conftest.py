@@ -0,0 +1,23 @@
+"""Shared pytest fixtures."""
+
+from typing import Iterator
+from unittest.mock import MagicMock
+
+import pytest
+
+import src.reports
+
+
+@pytest.fixture(scope="module")
+def read_sql_patch() -> Iterator[MagicMock]:
+    """Replace pandas.read_sql with one MagicMock for a whole test module.
+
+    Tests should not use this directly; wrap it in a function-scoped fixture
+    that resets the mock between tests.
+    """
+
+    original = src.reports.pd.read_sql
+    mock = MagicMock()
+    src.reports.pd.read_sql = mock
+    yield mock
+    src.reports.pd.read_sql = original
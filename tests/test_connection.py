@@ -1,13 +1,22 @@
 """Tests for Teradata connection management."""
 
+import gc
+import json
+import stat
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
 import pytest
 from pathlib import Path
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
 import yaml
 
 from src.connection import (
+    _YAML_CACHE,
     TeradataConnection,
     TeradataConnectionError,
+    _get_manager,
+    close_connections,
     get_connection,
 )
 
@@ -35,15 +44,20 @@ def sample_config():
     }
 
 
-@pytest.fixture
-def temp_config_file(tmp_path, sample_config):
-    """Create a temporary config file."""
+def write_config(tmp_path, config):
+    """Dump a config mapping to td_env.yaml under tmp_path and return its path."""
     config_file = tmp_path / "td_env.yaml"
     with open(config_file, "w") as f:
-        yaml.dump(sample_config, f)
+        yaml.dump(config, f)
     return config_file
 
 
+@pytest.fixture
+def temp_config_file(tmp_path, sample_config):
+    """Create a temporary config file."""
+    return write_config(tmp_path, sample_config)
+
+
 class TestTeradataConnection:
     """Test cases for TeradataConnection class."""
 
@@ -70,10 +84,17 @@ class TestTeradataConnection:
         assert "prod" in envs
         assert len(envs) == 2
 
+    def test_contains_environment(self, temp_config_file):
+        """Test membership checks against configured environments."""
+        conn = TeradataConnection(str(temp_config_file))
+        assert "prod" in conn
+        assert "staging" not in conn
+
     def test_build_connection_string_success(self, temp_config_file):
         """Test building connection string successfully."""
         conn = TeradataConnection(str(temp_config_file))
-        conn_str = conn._build_connection_string("test")
+        conn_url = conn._build_connection_string("test")
+        conn_str = conn_url.render_as_string(hide_password=False)
 
         assert "teradatasql://" in conn_str
         assert "testuser" in conn_str
@@ -81,6 +102,55 @@ class TestTeradataConnection:
         assert "testdb" in conn_str
         assert "LOGMECH=TD2" in conn_str
         assert "TMODE=ANSI" in conn_str
+        assert "ENCRYPTDATA" not in conn_str
+
+    def test_build_connection_string_encryptdata(self, tmp_path, sample_config):
+        """Test that encryptdata is passed through when configured."""
+        sample_config["test"]["encryptdata"] = True
+        config_file = write_config(tmp_path, sample_config)
+
+        conn = TeradataConnection(str(config_file))
+
+        assert conn._build_connection_string("test").query["ENCRYPTDATA"] == "true"
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        [("false", "false"), ("No", "false"), ("off", "false"), ("yes", "true")],
+    )
+    def test_build_connection_string_encryptdata_strings(
+        self, tmp_path, sample_config, value, expected
+    ):
+        """Test that string encryptdata values are parsed, not truth-tested."""
+        sample_config["test"]["encryptdata"] = value
+        config_file = write_config(tmp_path, sample_config)
+
+        conn = TeradataConnection(str(config_file))
+
+        assert conn._build_connection_string("test").query["ENCRYPTDATA"] == expected
+
+    @pytest.mark.parametrize("value", ["maybe", 1, None])
+    def test_build_connection_string_encryptdata_invalid(
+        self, tmp_path, sample_config, value
+    ):
+        """Test that unrecognised encryptdata values are rejected."""
+        sample_config["test"]["encryptdata"] = value
+        config_file = write_config(tmp_path, sample_config)
+
+        with pytest.raises(TeradataConnectionError, match="encryptdata for 'test'"):
+            TeradataConnection(str(config_file))
+
+    def test_build_connection_string_escapes_credentials(self, tmp_path, sample_config):
+        """Test that special characters in credentials are URL-escaped."""
+        sample_config["test"]["password"] = "p@ss:w/rd%"
+        config_file = write_config(tmp_path, sample_config)
+
+        conn = TeradataConnection(str(config_file))
+        conn_url = conn._build_connection_string("test")
+
+        assert conn_url.password == "p@ss:w/rd%"
+        assert conn_url.host == "test-server.com"
+        assert "p%40ss%3Aw%2Frd%25" in conn_url.render_as_string(hide_password=False)
+        assert "p@ss" not in str(conn_url)
 
     def test_build_connection_string_missing_env(self, temp_config_file):
         """Test building connection string with missing environment."""
@@ -88,8 +158,8 @@ class TestTeradataConnection:
         with pytest.raises(TeradataConnectionError, match="not found in configuration"):
             conn._build_connection_string("nonexistent")
 
-    def test_build_connection_string_missing_params(self, tmp_path):
-        """Test building connection string with missing required parameters."""
+    def test_missing_params_fail_at_load(self, tmp_path):
+        """Test that missing required parameters are reported at load time."""
         incomplete_config = {
             "test": {
                 "host": "test-server.com",
@@ -101,11 +171,10 @@ class TestTeradataConnection:
         with open(config_file, "w") as f:
             yaml.dump(incomplete_config, f)
 
-        conn = TeradataConnection(str(config_file))
         with pytest.raises(
-            TeradataConnectionError, match="Missing required parameters"
+            TeradataConnectionError, match="Missing required parameters for 'test'"
         ):
-            conn._build_connection_string("test")
+            TeradataConnection(str(config_file))
 
     @patch("src.connection.create_engine")
     def test_get_engine_success(self, mock_create_engine, temp_config_file):
@@ -124,6 +193,122 @@ class TestTeradataConnection:
         assert "test" in conn._engines
         mock_create_engine.assert_called_once()
 
+    @patch("src.connection.create_engine")
+    def test_get_engine_pool_settings(
+        self, mock_create_engine, tmp_path, sample_config
+    ):
+        """Test that pool settings are read from the environment config."""
+        sample_config["test"].update(pool_pre_ping=True, pool_recycle=600)
+        config_file = write_config(tmp_path, sample_config)
+
+        mock_engine = Mock()
+        mock_engine.connect.return_value.__enter__ = Mock(return_value=Mock())
+        mock_engine.connect.return_value.__exit__ = Mock(return_value=False)
+        mock_create_engine.return_value = mock_engine
+
+        conn = TeradataConnection(str(config_file))
+        conn.get_engine("test")
+        conn.get_engine("prod")
+
+        test_kwargs = mock_create_engine.call_args_list[0].kwargs
+        assert test_kwargs["pool_pre_ping"] is True
+        assert test_kwargs["pool_recycle"] == 600
+        prod_kwargs = mock_create_engine.call_args_list[1].kwargs
+        assert prod_kwargs["pool_pre_ping"] is False
+        assert prod_kwargs["pool_recycle"] == 1800
+        assert prod_kwargs["pool_size"] == 10
+        assert prod_kwargs["max_overflow"] == 10
+        assert prod_kwargs["pool_timeout"] == 30
+        # Only the pre-ping environment is probed on creation
+        mock_engine.connect.assert_called_once()
+
+    @patch("src.connection.create_engine")
+    def test_get_engine_pool_mapping_and_overrides(
+        self, mock_create_engine, tmp_path, sample_config
+    ):
+        """Test the nested pool mapping and explicit get_engine arguments."""
+        sample_config["test"]["pool"] = {"size": 3, "recycle": None}
+        sample_config["prod"]["pool"] = {"size": 3, "timeout": 5}
+        config_file = write_config(tmp_path, sample_config)
+
+        mock_create_engine.return_value = MagicMock()
+
+        conn = TeradataConnection(str(config_file))
+        conn.get_engine("test")
+        conn.get_engine("prod", pool_size=20)
+
+        test_kwargs = mock_create_engine.call_args_list[0].kwargs
+        assert test_kwargs["pool_size"] == 3
+        assert test_kwargs["pool_recycle"] == -1
+        assert test_kwargs["pool_pre_ping"] is True
+        prod_kwargs = mock_create_engine.call_args_list[1].kwargs
+        assert prod_kwargs["pool_size"] == 20
+        assert prod_kwargs["pool_timeout"] == 5
+        assert prod_kwargs["pool_pre_ping"] is False
+
+    @patch("src.connection.create_engine")
+    def test_get_engine_pre_ping_strings(
+        self, mock_create_engine, tmp_path, sample_config
+    ):
+        """Test that string pre_ping values are parsed, not truth-tested."""
+        sample_config["test"]["pool"] = {"recycle": None, "pre_ping": "false"}
+        sample_config["prod"]["pool_pre_ping"] = "yes"
+        config_file = write_config(tmp_path, sample_config)
+
+        mock_create_engine.return_value = MagicMock()
+
+        conn = TeradataConnection(str(config_file))
+        conn.get_engine("test")
+        conn.get_engine("prod")
+
+        assert mock_create_engine.call_args_list[0].kwargs["pool_pre_ping"] is False
+        assert mock_create_engine.call_args_list[1].kwargs["pool_pre_ping"] is True
+
+    @patch("src.connection.create_engine")
+    def test_get_engine_pre_ping_invalid(
+        self, mock_create_engine, tmp_path, sample_config
+    ):
+        """Test that an unrecognised pre_ping value is rejected."""
+        sample_config["test"]["pool"] = {"pre_ping": "sometimes"}
+        config_file = write_config(tmp_path, sample_config)
+
+        conn = TeradataConnection(str(config_file))
+
+        with pytest.raises(TeradataConnectionError, match="pre_ping for 'test'"):
+            conn.get_engine("test")
+        mock_create_engine.assert_not_called()
+
+    @patch("src.connection.event.listen")
+    @patch("src.connection.create_engine")
+    def test_get_engine_query_band(
+        self, mock_create_engine, mock_listen, tmp_path, sample_config
+    ):
+        """Test that a configured QueryBand is set on each new connection."""
+        sample_config["prod"]["query_band"] = {"Team": "capacity"}
+        config_file = write_config(tmp_path, sample_config)
+
+        conn = TeradataConnection(str(config_file))
+        conn.get_engine("test")
+        mock_listen.assert_not_called()
+
+        engine = conn.get_engine("prod")
+        target, identifier, listener = mock_listen.call_args.args
+        assert target is engine
+        assert identifier == "connect"
+
+        dbapi_conn = Mock()
+        listener(dbapi_conn, None)
+        dbapi_conn.cursor.return_value.execute.assert_called_once_with(
+            "SET QUERY_BAND = 'Application=PDCRReport;Env=prod;Team=capacity;' "
+            "FOR SESSION"
+        )
+        dbapi_conn.cursor.return_value.close.assert_called_once()
+
+    def test_query_band_rejects_quotes(self):
+        """Test that band values cannot break out of the SQL literal."""
+        with pytest.raises(TeradataConnectionError, match="Invalid query_band"):
+            TeradataConnection._query_band("prod", {"query_band": {"Team": "x';"}})
+
     @patch("src.connection.create_engine")
     def test_get_engine_cached(self, mock_create_engine, temp_config_file):
         """Test that engine is cached after first creation."""
@@ -141,6 +326,70 @@ class TestTeradataConnection:
         # Should only create engine once
         mock_create_engine.assert_called_once()
 
+    @patch("src.connection.create_engine")
+    def test_get_engine_concurrent_first_use(
+        self, mock_create_engine, temp_config_file
+    ):
+        """Test that concurrent first use creates a single engine."""
+        mock_engine = Mock()
+        mock_engine.connect.return_value.__enter__ = Mock(return_value=Mock())
+        mock_engine.connect.return_value.__exit__ = Mock(return_value=False)
+
+        def slow_create_engine(*args, **kwargs):
+            time.sleep(0.05)
+            return mock_engine
+
+        mock_create_engine.side_effect = slow_create_engine
+
+        conn = TeradataConnection(str(temp_config_file))
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            engines = list(pool.map(lambda _: conn.get_engine("test"), range(4)))
+
+        assert all(engine is mock_engine for engine in engines)
+        mock_create_engine.assert_called_once()
+
+    @patch("src.connection.create_engine")
+    def test_eager_envs_prefetched(self, mock_create_engine, temp_config_file):
+        """Test that eager environments get an engine and a pooled connection."""
+        mock_create_engine.return_value = MagicMock()
+
+        conn = TeradataConnection(str(temp_config_file), eager_envs=["test", "prod"])
+        wait(conn._prefetch)
+
+        assert set(conn._engines) == {"test", "prod"}
+        assert mock_create_engine.return_value.connect.call_count == 2
+
+    def test_eager_envs_unknown(self, temp_config_file):
+        """Test that prefetching an unconfigured environment fails fast."""
+        with pytest.raises(TeradataConnectionError, match="unknown environments"):
+            TeradataConnection(str(temp_config_file), eager_envs=["staging"])
+
+    @patch("src.connection.create_engine")
+    def test_eager_envs_empty_iterator(self, mock_create_engine, temp_config_file):
+        """Test that an empty eager_envs iterator prefetches nothing."""
+        conn = TeradataConnection(str(temp_config_file), eager_envs=iter([]))
+
+        assert conn._prefetch == ()
+        mock_create_engine.assert_not_called()
+
+    def test_eager_envs_rejects_string(self, temp_config_file):
+        """Test that a bare environment name is not split into characters."""
+        with pytest.raises(TypeError, match="'prod'"):
+            TeradataConnection(str(temp_config_file), eager_envs="prod")
+
+    @patch("src.connection.create_engine")
+    def test_validate_on_create(self, mock_create_engine, temp_config_file):
+        """Test that validate_on_create overrides the pre-ping default."""
+        mock_create_engine.return_value = MagicMock()
+
+        conn = TeradataConnection(str(temp_config_file), validate_on_create=True)
+        conn.get_engine("prod")
+
+        engine = mock_create_engine.return_value
+        engine.connect.assert_called_once()
+        executed = engine.connect.return_value.__enter__.return_value.execute
+        assert str(executed.call_args.args[0]) == "SELECT 1"
+
     @patch("src.connection.create_engine")
     def test_get_connection_context_manager(self, mock_create_engine, temp_config_file):
         """Test using connection as context manager."""
@@ -175,6 +424,21 @@ class TestTeradataConnection:
         assert len(conn._engines) == 0
         assert mock_engine.dispose.call_count == 2
 
+    @patch("src.connection.create_engine")
+    def test_engines_disposed_on_garbage_collection(
+        self, mock_create_engine, temp_config_file
+    ):
+        """Test that dropping the manager disposes its engines."""
+        mock_engine = Mock()
+        mock_create_engine.return_value = mock_engine
+
+        conn = TeradataConnection(str(temp_config_file))
+        conn.get_engine("test")
+        del conn
+        gc.collect()
+
+        mock_engine.dispose.assert_called_once()
+
     def test_invalid_yaml(self, tmp_path):
         """Test handling of invalid YAML file."""
         invalid_file = tmp_path / "invalid.yaml"
@@ -184,9 +448,98 @@ class TestTeradataConnection:
         with pytest.raises(TeradataConnectionError, match="Error parsing YAML"):
             TeradataConnection(str(invalid_file))
 
+    def test_empty_config_file(self, tmp_path):
+        """Test that an empty config file is reported as invalid."""
+        empty_file = tmp_path / "empty.yaml"
+        empty_file.write_text("")
+
+        with pytest.raises(TeradataConnectionError, match="Invalid configuration"):
+            TeradataConnection(str(empty_file))
+
+    def test_config_cache_returns_independent_copies(self, temp_config_file):
+        """Test that cached configuration is not shared between instances."""
+        conn1 = TeradataConnection(str(temp_config_file))
+        conn1._config["test"]["host"] = "mutated.com"
+
+        conn2 = TeradataConnection(str(temp_config_file))
+
+        assert conn2._config["test"]["host"] == "test-server.com"
+        assert any(key[0] == str(temp_config_file.resolve()) for key in _YAML_CACHE)
+
+    def test_config_cache_skips_parse(self, temp_config_file):
+        """Test that repeat construction reuses the parsed config."""
+        TeradataConnection(str(temp_config_file))
+
+        with patch("src.connection.yaml.load") as mock_load, patch.object(
+            TeradataConnection, "_read_sidecar"
+        ) as mock_sidecar:
+            TeradataConnection(str(temp_config_file))
+
+        mock_load.assert_not_called()
+        mock_sidecar.assert_not_called()
+
+    def test_config_cache_invalidated_on_change(self, temp_config_file, sample_config):
+        """Test that editing the config file is picked up by new instances."""
+        TeradataConnection(str(temp_config_file))
+
+        sample_config["dev"] = dict(sample_config["test"], host="dev-server.com")
+        with open(temp_config_file, "w") as f:
+            yaml.dump(sample_config, f)
+
+        conn = TeradataConnection(str(temp_config_file))
+        assert conn._config["dev"]["host"] == "dev-server.com"
+
+    def test_json_sidecar_written_and_used(self, temp_config_file):
+        """Test that a JSON sidecar is written and preferred while fresh."""
+        TeradataConnection(str(temp_config_file))
+        sidecar = temp_config_file.with_name(".td_env.yaml.json")
+        assert sidecar.exists()
+        assert stat.S_IMODE(sidecar.stat().st_mode) == 0o600
+        config_stat = temp_config_file.stat()
+        assert json.loads(sidecar.read_text())["source"] == [
+            config_stat.st_mtime_ns,
+            config_stat.st_size,
+        ]
+        assert not list(temp_config_file.parent.glob("*.tmp"))
+
+        _YAML_CACHE.clear()
+        with patch("src.connection.yaml.load") as mock_load:
+            conn = TeradataConnection(str(temp_config_file))
+
+        mock_load.assert_not_called()
+        assert conn._config["test"]["host"] == "test-server.com"
+
+    @pytest.mark.parametrize(
+        "mtime_delta,size_delta", [(1, 0), (0, 1)], ids=["mtime", "size"]
+    )
+    def test_stale_json_sidecar_ignored(
+        self, temp_config_file, mtime_delta, size_delta
+    ):
+        """Test that a sidecar not matching the YAML mtime and size is ignored."""
+        config_stat = temp_config_file.stat()
+        mtime_ns = config_stat.st_mtime_ns + mtime_delta
+        size = config_stat.st_size + size_delta
+        sidecar = temp_config_file.with_name(".td_env.yaml.json")
+        sidecar.write_text(
+            json.dumps({"source": [mtime_ns, size], "config": {"stale": {}}})
+        )
+
+        conn = TeradataConnection(str(temp_config_file))
+
+        assert "stale" not in conn._config
+        assert "stale" not in json.loads(sidecar.read_text())["config"]
+
+
+@pytest.fixture
+def clear_manager_cache():
+    """Reset the process-wide manager cache around a test."""
+    _get_manager.cache_clear()
+    yield
+    _get_manager.cache_clear()
+
 
 @patch("src.connection.TeradataConnection")
-def test_get_connection_convenience_function(mock_conn_class):
+def test_get_connection_convenience_function(mock_conn_class, clear_manager_cache):
     """Test the convenience function."""
     mock_instance = Mock()
     mock_engine = Mock()
@@ -198,3 +551,24 @@ def test_get_connection_convenience_function(mock_conn_class):
     mock_conn_class.assert_called_once_with("/path/to/config.yaml")
     mock_instance.get_engine.assert_called_once_with("test")
     assert engine == mock_engine
+
+
+@patch("src.connection.TeradataConnection")
+def test_get_connection_reuses_manager(mock_conn_class, clear_manager_cache):
+    """Test that repeated calls share one connection manager."""
+    get_connection("test", "/path/to/config.yaml")
+    get_connection("prod", "/path/to/config.yaml")
+
+    mock_conn_class.assert_called_once_with("/path/to/config.yaml")
+    assert mock_conn_class.return_value.get_engine.call_count == 2
+
+
+@patch("src.connection.TeradataConnection")
+def test_close_connections_closes_shared_manager(mock_conn_class, clear_manager_cache):
+    """Test that close_connections disposes the manager get_connection uses."""
+    get_connection("test", "/path/to/config.yaml")
+
+    close_connections("/path/to/config.yaml")
+
+    mock_conn_class.assert_called_once_with("/path/to/config.yaml")
+    mock_conn_class.return_value.close_all.assert_called_once_with()
@@ -1,19 +1,31 @@
 """Tests for PDCRInfoReport query methods."""
 
-from datetime import date
-from unittest.mock import Mock, patch
+import logging
+import os
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, Mock, patch
 
 import pandas as pd
 import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
 
-from src.reports import PDCRInfoReport
+from src.reports import PDCRInfoReport, _TTLCache, _yesterday_iso
 
+# Read-only result shared by every test that does not care about rows.
+_EMPTY_DF = pd.DataFrame()
 
+
+@dataclass(frozen=True)
 class _DummyContext:
     """Simple context manager that returns a provided engine mock."""
 
-    def __init__(self, engine: object) -> None:
-        self.engine = engine
+    __slots__ = ("engine",)
+
+    engine: object
 
     def __enter__(self) -> object:  # pragma: no cover - trivial
         return self.engine
@@ -22,109 +34,627 @@ class _DummyContext:
         return False
 
 
+# The context is stateless, so every fake connection manager can share one.
+_SHARED_ENGINE = object()
+_SHARED_CTX = _DummyContext(_SHARED_ENGINE)
+
+
+def _write_config(directory):
+    """Write a minimal valid connection config into directory."""
+
+    config_file = directory / "td_env.yaml"
+    config_file.write_text(
+        "test:\n"
+        "  host: test-server.com\n"
+        "  username: testuser\n"
+        "  password: testpass\n"
+        "  database: testdb\n"
+    )
+    return config_file
+
+
 @pytest.fixture()
-def report_with_engine() -> tuple[PDCRInfoReport, object, Mock]:
-    """Provide a PDCRInfoReport wired to a mocked connection manager."""
+def config_file(tmp_path):
+    """Write a minimal valid connection config."""
 
-    engine = object()
-    conn_mgr = Mock()
-    conn_mgr.get_connection.return_value = _DummyContext(engine)
+    return _write_config(tmp_path)
 
-    report = PDCRInfoReport()
-    report.conn_mgr = conn_mgr  # Inject mock to avoid real DB access
-    return report, engine, conn_mgr
 
+@pytest.fixture(autouse=True)
+def mock_read_sql(read_sql_patch: MagicMock) -> MagicMock:
+    """Reset the module-wide pandas.read_sql mock so no test reaches a database."""
 
-@patch("src.reports.pd.read_sql")
-def test_get_tablespace_history_params(mock_read_sql: Mock, report_with_engine: tuple) -> None:
-    report, engine, _ = report_with_engine
-    mock_read_sql.return_value = pd.DataFrame()
+    read_sql_patch.reset_mock(return_value=True, side_effect=True)
+    read_sql_patch.return_value = _EMPTY_DF
+    return read_sql_patch
 
-    report.get_tablespace_history(
-        env_name="test",
-        start_date="2024-01-01",
-        end_date="2024-01-02",
-        database_name="Sales",
+
+class _Flag(logging.Handler):
+    """Logging handler that remembers whether a slow DBQL warning arrived."""
+
+    hit = False
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.hit = self.hit or record.getMessage().startswith("Slow DBQL Summary query")
+
+
+@pytest.fixture()
+def slow_query_flag() -> _Flag:
+    """Attach a _Flag to the reports logger at WARNING for one test."""
+
+    reports_logger = logging.getLogger("src.reports")
+    flag = _Flag(logging.WARNING)
+    previous_level = reports_logger.level
+    reports_logger.addHandler(flag)
+    reports_logger.setLevel(logging.WARNING)
+    yield flag
+    reports_logger.removeHandler(flag)
+    reports_logger.setLevel(previous_level)
+
+
+def _fake_conn_mgr(context: _DummyContext = _SHARED_CTX) -> SimpleNamespace:
+    """Build a stand-in connection manager whose engine yields context.
+
+    Tests swap ``conn_mgr.engine.connect`` or ``conn_mgr.engine.pool`` to
+    change what the report sees.
+    """
+
+    engine = SimpleNamespace(
+        connect=lambda: context,
+        pool=SimpleNamespace(size=lambda: 5),
+    )
+    return SimpleNamespace(
+        engine=engine,
+        get_engine=lambda env_name: engine,
+        close_all=lambda: None,
     )
 
-    mock_read_sql.assert_called_once()
-    _, call_kwargs = mock_read_sql.call_args
-    assert call_kwargs["params"] == {
-        "start_date": "2024-01-01",
-        "end_date": "2024-01-02",
-        "database_name": "%Sales",
-    }
-    assert call_kwargs["con"] == engine
 
+@pytest.fixture(scope="module")
+def _shared_report(tmp_path_factory) -> PDCRInfoReport:
+    """Build one PDCRInfoReport per module; the config parse is the slow part.
 
-@patch("src.reports.pd.read_sql")
-def test_get_databasespace_history_params(mock_read_sql: Mock, report_with_engine: tuple) -> None:
-    report, engine, _ = report_with_engine
-    mock_read_sql.return_value = pd.DataFrame()
+    Arrow is off so dtypes do not depend on whether pyarrow is installed.
+    """
 
-    report.get_databasespace_history(
-        env_name="prod",
-        start_date="2024-02-01",
-        end_date="2024-02-05",
-        database_name="Finance%",
+    config_file = _write_config(tmp_path_factory.mktemp("reports"))
+    return PDCRInfoReport(str(config_file), use_arrow=False)
+
+
+@dataclass(frozen=True)
+class _Wired:
+    """A report plus the fake connection manager it is wired to."""
+
+    __slots__ = ("report", "engine", "conn_mgr")
+
+    report: PDCRInfoReport
+    engine: object
+    conn_mgr: SimpleNamespace
+
+
+@pytest.fixture()
+def wired(_shared_report) -> _Wired:
+    """Provide the shared report wired to a fresh fake connection manager."""
+
+    conn_mgr = _fake_conn_mgr()
+    _shared_report.conn_mgr = conn_mgr  # Avoid real DB access
+    _shared_report.clear_cache()
+    return _Wired(_shared_report, _SHARED_ENGINE, conn_mgr)
+
+
+def test_normalize_dates_defaults() -> None:
+    yesterday = (date.today() - timedelta(days=1)).isoformat()
+
+    assert PDCRInfoReport._normalize_dates(None, None) == ("1900-01-01", yesterday)
+    assert PDCRInfoReport._normalize_dates(date(2024, 1, 1), "2024-01-31") == (
+        "2024-01-01",
+        "2024-01-31",
     )
+    assert PDCRInfoReport._normalize_dates("", "") == ("1900-01-01", yesterday)
 
-    mock_read_sql.assert_called_once()
-    _, call_kwargs = mock_read_sql.call_args
-    assert call_kwargs["params"] == {
+
+@pytest.mark.parametrize(
+    "value,round_to,expected",
+    [
+        (datetime(2024, 1, 1, 13, 45, 10), "day", "2024-01-01"),
+        ("2024-01-01T13:45:10", "day", "2024-01-01"),
+        ("2024-01-01 13:45:10", "hour", "2024-01-01 13:00:00"),
+        (date(2024, 1, 1), "hour", "2024-01-01 00:00:00"),
+        ("2024-01-01T13:45:10", "none", "2024-01-01T13:45:10"),
+    ],
+)
+def test_normalize_dates_round_to(value, round_to: str, expected: str) -> None:
+    start, end = PDCRInfoReport._normalize_dates(value, value, round_to=round_to)
+
+    assert start == end == expected
+
+
+def test_normalize_dates_invalid_round_to() -> None:
+    with pytest.raises(ValueError, match="round_to"):
+        PDCRInfoReport._normalize_dates(None, None, round_to="minute")
+
+
+def test_yesterday_iso_rolls_with_day() -> None:
+    assert _yesterday_iso(date(2024, 3, 1).toordinal()) == "2024-02-29"
+    assert _yesterday_iso(date(2024, 3, 2).toordinal()) == "2024-03-01"
+
+
+@pytest.mark.parametrize(
+    "name,match_mode,expected",
+    [
+        ("Sales", "prefix", "Sales%"),
+        ("Sales", "contains", "%Sales%"),
+        ("Sales", "exact", "Sales"),
+        ("Sal_s%", "prefix", "Sal_s%"),
+        ("", "prefix", "%"),
+    ],
+)
+def test_database_filter_match_modes(name: str, match_mode: str, expected: str) -> None:
+    assert PDCRInfoReport._database_filter(name, match_mode) == expected
+
+
+def test_database_filter_legacy_default_warns() -> None:
+    for _ in range(2):  # warns on every call, not just the first uncached one
+        with pytest.warns(FutureWarning, match="match_mode"):
+            assert PDCRInfoReport._database_filter("Sales") == "%Sales"
+
+    with pytest.raises(ValueError, match="Invalid match_mode"):
+        PDCRInfoReport._database_filter("Sales", "suffix")
+
+
+# Table of history reports whose read_sql call is checked by
+# test_get_history_params; row i of each list describes one report.
+_METHOD_NAMES = [
+    "get_tablespace_history",
+    "get_databasespace_history",
+    "get_spoolspace_history",
+]
+_CALL_KWARGS = [
+    {
+        "env_name": "test",
+        "start_date": "2024-01-01",
+        "end_date": "2024-01-02",
+        "database_name": "Sales",
+    },
+    {
+        "env_name": "prod",
+        "start_date": "2024-02-01",
+        "end_date": "2024-02-05",
+        "database_name": "Finance%",
+    },
+    {
+        "env_name": "test",
+        "start_date": date(2024, 3, 1),
+        "end_date": date(2024, 3, 2),
+        "user_name": "etluser",
+        "account_name": "acct",
+    },
+]
+_EXPECTED_PARAMS = [
+    {
+        "start_date": "2024-01-01",
+        "end_date": "2024-01-02",
+        "database_name": "%Sales%",
+    },
+    {
         "start_date": "2024-02-01",
         "end_date": "2024-02-05",
         "database_name": "Finance%",
+    },
+    {
+        "start_date": "2024-03-01",
+        "end_date": "2024-03-02",
+        "user_name": "%etluser%",
+        "account_name": "%acct%",
+    },
+]
+_DTYPE_SAMPLES = [
+    ("CURRENTPERM", "Float64"),
+    ("PERMPCTUSED", "Float64"),
+    ("PEAKSPOOL", "Float64"),
+]
+_EXPECTED_DBQL_SUMMARY = {
+    "start_date": "2024-04-01",
+    "end_date": "2024-04-02",
+    "user_name": "etl%",
+}
+
+
+@pytest.mark.parametrize(
+    ("method_name", "kwargs", "expected_params", "dtype_sample"),
+    list(zip(_METHOD_NAMES, _CALL_KWARGS, _EXPECTED_PARAMS, _DTYPE_SAMPLES)),
+    ids=_METHOD_NAMES,
+)
+def test_get_history_params(
+    mock_read_sql: Mock,
+    wired: _Wired,
+    method_name: str,
+    kwargs: dict,
+    expected_params: dict,
+    dtype_sample: tuple,
+) -> None:
+    report = wired.report
+
+    getattr(report, method_name)(**kwargs)
+
+    mock_read_sql.assert_called_once()
+    args = mock_read_sql.call_args.args
+    call_kwargs = mock_read_sql.call_args.kwargs
+    assert call_kwargs["params"] == expected_params
+    assert call_kwargs["con"] is wired.engine
+    assert call_kwargs["parse_dates"] == ["LogDate"]
+    column, dtype = dtype_sample
+    assert call_kwargs["dtype"][column] == dtype
+    assert "TRIM(" not in str(args[0])
+
+
+def test_get_tablespace_history_trim(mock_read_sql: Mock, wired: _Wired) -> None:
+    report = wired.report
+
+    report.get_tablespace_history(env_name="test", database_name="Sales", trim=True)
+
+    args = mock_read_sql.call_args.args
+    call_kwargs = mock_read_sql.call_args.kwargs
+    assert call_kwargs["params"]["database_name"] == "%Sales"
+    assert "TRIM(DatabaseName) LIKE :database_name" in str(args[0])
+
+
+def test_get_tablespace_history_columns(mock_read_sql: Mock, wired: _Wired) -> None:
+    report = wired.report
+
+    report.get_tablespace_history(
+        env_name="test", columns=["DatabaseName", "CURRENTPERM"]
+    )
+
+    args = mock_read_sql.call_args.args
+    call_kwargs = mock_read_sql.call_args.kwargs
+    sql = str(args[0])
+    assert "CURRENTPERM" in sql
+    assert "Tablename," not in sql
+    assert call_kwargs["parse_dates"] == []
+    assert call_kwargs["dtype"] == {
+        "DatabaseName": "category",
+        "CURRENTPERM": "Float64",
     }
-    assert call_kwargs["con"] == engine
 
 
-@patch("src.reports.pd.read_sql")
-def test_get_spoolspace_history_params(mock_read_sql: Mock, report_with_engine: tuple) -> None:
-    report, engine, _ = report_with_engine
-    mock_read_sql.return_value = pd.DataFrame()
+def _sqlite_pdcr_engine():
+    """Build an in-memory SQLite engine with one PDCRINFO.TableSpace_Hst row."""
 
-    report.get_spoolspace_history(
-        env_name="test",
-        start_date=date(2024, 3, 1),
-        end_date=date(2024, 3, 2),
-        user_name="etl_user",
-        account_name="acct",
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ATTACH DATABASE ':memory:' AS PDCRINFO")
+        conn.exec_driver_sql(
+            "CREATE TABLE PDCRINFO.TableSpace_Hst (LogDate TEXT, DatabaseName TEXT,"
+            " Tablename TEXT, AccountName TEXT, CURRENTPERM FLOAT, PEAKPERM FLOAT,"
+            " CURRENTPERMSKEW FLOAT, PEAKPERMSKEW FLOAT)"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO PDCRINFO.TableSpace_Hst VALUES"
+            " ('2024-01-01', 'Sales', 'Orders', 'acct', 100.5, 200.25, 0.1, 0.2)"
+        )
+    return engine
+
+
+def test_get_tablespace_history_fractional_perm(
+    mock_read_sql: Mock, wired: _Wired
+) -> None:
+    engine = _sqlite_pdcr_engine()
+    wired.conn_mgr.engine.connect = engine.connect
+    mock_read_sql.side_effect = pd.io.sql.read_sql  # the real read_sql
+
+    df = wired.report.get_tablespace_history(
+        "test", "2024-01-01", "2024-01-01", "Sales", match_mode="exact"
     )
 
+    assert df["CURRENTPERM"].tolist() == [100.5]
+    assert str(df["PEAKPERM"].dtype) == "Float64"
+    assert df["DatabaseName"].dtype == "category"
+
+
+def test_history_sorted_client_side(mock_read_sql: Mock, wired: _Wired) -> None:
+    report = wired.report
+    mock_read_sql.return_value = pd.DataFrame(
+        {"LogDate": ["2024-01-02", "2024-01-01"], "UserName": ["b", "a"]}
+    )
+
+    unsorted = report.get_DBQLSummaryTable_History("test", "2024-01-01", "2024-01-02")
+    result = report.get_DBQLSummaryTable_History(
+        "test", "2024-01-01", "2024-01-02", sort=True
+    )
+
+    assert "ORDER BY" not in str(mock_read_sql.call_args.args[0])
+    assert unsorted["UserName"].tolist() == ["b", "a"]
+    assert result["UserName"].tolist() == ["a", "b"]
+    assert result.index.tolist() == [0, 1]
     mock_read_sql.assert_called_once()
-    _, call_kwargs = mock_read_sql.call_args
-    assert call_kwargs["params"] == {
-        "start_date": "2024-03-01",
-        "end_date": "2024-03-02",
-        "user_name": "%etl_user",
-        "account_name": "%acct",
-    }
-    assert call_kwargs["con"] == engine
+
+    with pytest.raises(ValueError, match="iter_batches"):
+        report.get_DBQLSummaryTable_History("test", sort=True, iter_batches=True)
+
+
+def test_unknown_columns_rejected(wired: _Wired) -> None:
+    report = wired.report
+
+    with pytest.raises(ValueError, match="Unknown columns"):
+        report.get_DBQLSummaryTable_History("test", columns=["LogDate; DROP TABLE x"])
+
+
+def test_exact_match_uses_equality(mock_read_sql: Mock, wired: _Wired) -> None:
+    report = wired.report
+
+    report.get_spoolspace_history(
+        env_name="test", user_name="etluser", account_name="acct%", match_mode="exact"
+    )
+
+    args = mock_read_sql.call_args.args
+    call_kwargs = mock_read_sql.call_args.kwargs
+    # Bare names compare with '=', which ignores the pad; patterns keep LIKE.
+    assert call_kwargs["params"]["user_name"] == "etluser"
+    assert call_kwargs["params"]["account_name"] == "acct%"
+    assert "UserName = :user_name" in str(args[0])
+    assert "AccountName LIKE :account_name" in str(args[0])
+
+
+def test_get_spoolspace_history_trim(mock_read_sql: Mock, wired: _Wired) -> None:
+    report = wired.report
+
+    report.get_spoolspace_history(
+        env_name="test", user_name="etl%", account_name="  ", trim=True
+    )
+
+    args = mock_read_sql.call_args.args
+    call_kwargs = mock_read_sql.call_args.kwargs
+    assert call_kwargs["params"]["user_name"] == "etl%"
+    assert call_kwargs["params"]["account_name"] == "%"
+    assert "TRIM(UserName) LIKE :user_name" in str(args[0])
+    assert "TRIM(AccountName) LIKE :account_name" in str(args[0])
 
 
-@patch("src.reports.time.perf_counter", side_effect=[0.0, 6.2])
-@patch("src.reports.pd.read_sql")
 def test_get_dbql_summary_slow_warning(
-    mock_read_sql: Mock, mock_perf: Mock, report_with_engine: tuple, caplog
+    mock_read_sql: Mock, wired: _Wired, slow_query_flag: _Flag
 ) -> None:
-    report, engine, _ = report_with_engine
-    caplog.set_level("WARNING")
-    mock_read_sql.return_value = pd.DataFrame()
+    report = wired.report
 
     report.get_DBQLSummaryTable_History(
         env_name="prod",
         start_date="2024-04-01",
         end_date="2024-04-02",
         user_name="etl%",
+        _clock=iter([0.0, 6.2]).__next__,
+    )
+
+    mock_read_sql.assert_called_once()
+    call_kwargs = mock_read_sql.call_args.kwargs
+    assert call_kwargs["params"] == _EXPECTED_DBQL_SUMMARY
+    assert call_kwargs["con"] is wired.engine
+    assert call_kwargs["parse_dates"] == ["LogDate"]
+    assert call_kwargs["dtype"]["UserName"] == "category"
+    assert slow_query_flag.hit
+
+
+def test_history_results_cached(mock_read_sql: Mock, wired: _Wired) -> None:
+    report = wired.report
+    mock_read_sql.return_value = pd.DataFrame({"DatabaseName": ["Sales"]})
+
+    first = report.get_tablespace_history("test", "2024-01-01", "2024-01-02", "Sales")
+    second = report.get_tablespace_history("test", "2024-01-01", "2024-01-02", "Sales")
+
+    mock_read_sql.assert_called_once()
+    assert first is not second
+    assert second.equals(first)
+
+    report.clear_cache()
+    report.get_tablespace_history("test", "2024-01-01", "2024-01-02", "Sales")
+    assert mock_read_sql.call_count == 2
+
+
+def test_history_cache_isolates_mutations(mock_read_sql: Mock, wired: _Wired) -> None:
+    report = wired.report
+    mock_read_sql.return_value = pd.DataFrame(
+        {"DatabaseName": ["Sales"], "CURRENTPERM": [1.0]}
+    )
+
+    first = report.get_tablespace_history("test", match_mode="prefix")
+    first.loc[0, "CURRENTPERM"] = -999.0
+    second = report.get_tablespace_history("test", match_mode="prefix")
+    second_sorted = report.get_tablespace_history(
+        "test", match_mode="prefix", sort=True
+    )
+
+    assert mock_read_sql.call_count == 1
+    assert second.loc[0, "CURRENTPERM"] == 1.0
+    assert second_sorted.loc[0, "CURRENTPERM"] == 1.0
+
+
+def test_dbcinfo_cached_per_env(mock_read_sql: Mock, wired: _Wired) -> None:
+    report = wired.report
+    mock_read_sql.return_value = pd.DataFrame(
+        {"InfoKey": ["VERSION"], "InfoData": ["17"]}
+    )
+
+    first = report.get_dbcinfo("test")
+    first.loc[0, "InfoData"] = "changed"
+    second = report.get_dbcinfo("test")
+    report.get_dbcinfo("prod")
+
+    assert mock_read_sql.call_count == 2
+    assert second.loc[0, "InfoData"] == "17"
+
+    report.clear_cache()
+    report.get_dbcinfo("test")
+    assert mock_read_sql.call_count == 3
+
+
+def test_history_cache_disabled(mock_read_sql: Mock, config_file) -> None:
+    report = PDCRInfoReport(str(config_file), cache_ttl=0)
+    report.conn_mgr = _fake_conn_mgr()
+
+    report.get_tablespace_history("test", "2024-01-01", "2024-01-02", "Sales%")
+    report.get_tablespace_history("test", "2024-01-01", "2024-01-02", "Sales%")
+
+    assert mock_read_sql.call_count == 2
+
+
+def test_ttl_cache_expires_entries() -> None:
+    now = [0.0]
+    cache = _TTLCache(maxsize=2, ttl=10, timer=lambda: now[0])
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+
+    assert cache.get("a") is None  # evicted as least recently used
+    assert cache.get("b") == 2
+    now[0] = 10.0
+    assert cache.get("b") is None
+    assert len(cache) == 1
+
+
+def test_iter_batches_streams_and_closes(mock_read_sql: Mock, wired: _Wired) -> None:
+    report, conn_mgr = wired.report, wired.conn_mgr
+    connection = Mock()
+    connection.execution_options.return_value = connection
+    conn_mgr.engine.connect = lambda: connection
+    batches = [pd.DataFrame({"UserName": ["a"]}), pd.DataFrame({"UserName": ["b"]})]
+    mock_read_sql.return_value = iter(batches)
+
+    result = report.get_spoolspace_history("test", user_name="etl%", iter_batches=True)
+
+    assert list(result) == batches
+    connection.execution_options.assert_called_once_with(
+        stream_results=True, yield_per=50_000
     )
+    assert mock_read_sql.call_args.kwargs["chunksize"] == 50_000
+    connection.close.assert_called_once()
+
+
+def test_disk_cache_shared_across_instances(
+    mock_read_sql: Mock, config_file, tmp_path
+) -> None:
+    pytest.importorskip("pyarrow")
+    mock_read_sql.return_value = pd.DataFrame(
+        {"DatabaseName": ["Sales"], "CURRENTPERM": [1]}
+    )
+    cache_dir = tmp_path / "cache"
+
+    for _ in range(2):
+        report = PDCRInfoReport(str(config_file), disk_cache_dir=cache_dir)
+        report.conn_mgr = _fake_conn_mgr()
+        df = report.get_tablespace_history("test", "2024-01-01", "2024-01-02", "Sales%")
 
     mock_read_sql.assert_called_once()
-    _, call_kwargs = mock_read_sql.call_args
-    assert call_kwargs["params"] == {
-        "start_date": "2024-04-01",
-        "end_date": "2024-04-02",
-        "user_name": "etl%",
+    assert df["DatabaseName"].tolist() == ["Sales"]
+
+    report.clear_cache()
+    assert not list(cache_dir.glob("*.parquet"))
+
+
+@pytest.mark.parametrize("use_arrow", [False, True], ids=["numpy", "arrow"])
+def test_disk_cache_preserves_dtypes(
+    mock_read_sql: Mock, config_file, tmp_path, use_arrow: bool
+) -> None:
+    pytest.importorskip("pyarrow")
+    engine = _sqlite_pdcr_engine()
+    mock_read_sql.side_effect = pd.io.sql.read_sql  # the real read_sql
+
+    def fetch(arrow: bool) -> pd.DataFrame:
+        report = PDCRInfoReport(
+            str(config_file), use_arrow=arrow, disk_cache_dir=tmp_path
+        )
+        report.conn_mgr = _fake_conn_mgr()
+        report.conn_mgr.engine.connect = engine.connect
+        return report.get_tablespace_history(
+            "test", "2024-01-01", "2024-01-01", "Sales%"
+        )
+
+    fresh = fetch(use_arrow)
+    from_disk = fetch(use_arrow)
+    other_backend = fetch(not use_arrow)
+
+    # The second call is served from disk; the other backend has its own entry.
+    assert mock_read_sql.call_count == 2
+    assert from_disk.dtypes.to_dict() == fresh.dtypes.to_dict()
+    assert other_backend.dtypes.to_dict() != fresh.dtypes.to_dict()
+
+
+@patch("src.reports._HAS_PYARROW", True)
+def test_disk_cache_ttl(config_file, tmp_path) -> None:
+    report = PDCRInfoReport(
+        str(config_file), disk_cache_dir=tmp_path, disk_cache_ttl=60
+    )
+    path = tmp_path / "tablespace-0.parquet"
+    path.write_bytes(b"")
+    old = time.time() - 120
+    os.utime(path, (old, old))
+
+    assert report._read_disk_cache(path) is None
+    assert report._read_disk_cache(tmp_path / "missing.parquet") is None
+
+
+@patch("src.reports._HAS_PYARROW", False)
+def test_disk_cache_requires_pyarrow(config_file, tmp_path) -> None:
+    with pytest.raises(ImportError, match="pyarrow"):
+        PDCRInfoReport(str(config_file), disk_cache_dir=tmp_path)
+
+
+@patch.dict("src.reports._READ_SQL_OPTIONS", {"dtype_backend": "pyarrow"})
+def test_read_sql_options_forwarded(mock_read_sql: Mock, config_file) -> None:
+    report = PDCRInfoReport(str(config_file))
+    report.conn_mgr = _fake_conn_mgr()
+
+    report.get_databasespace_history(env_name="test")
+
+    assert mock_read_sql.call_args.kwargs["dtype_backend"] == "pyarrow"
+    # Arrow already types the numeric columns; only categoricals are cast.
+    assert mock_read_sql.call_args.kwargs["dtype"] == {
+        "DatabaseName": "category",
+        "AccountName": "category",
     }
-    assert call_kwargs["con"] == engine
-    assert any("Slow DBQL Summary query" in message for message in caplog.messages)
\ No newline at end of file
+
+
+@patch.dict("src.reports._READ_SQL_OPTIONS", {"dtype_backend": "pyarrow"})
+def test_use_arrow_disabled(mock_read_sql: Mock, config_file) -> None:
+    report = PDCRInfoReport(str(config_file), use_arrow=False)
+    report.conn_mgr = _fake_conn_mgr()
+
+    report.get_databasespace_history(env_name="test")
+
+    assert "dtype_backend" not in mock_read_sql.call_args.kwargs
+    assert mock_read_sql.call_args.kwargs["dtype"]["CURRENTPERM"] == "Float64"
+
+
+def test_get_all_space_history_runs_each_query(
+    mock_read_sql: Mock, wired: _Wired
+) -> None:
+    report = wired.report
+
+    frames = report.get_all_space_history(
+        env_name="test", start_date="2024-05-01", end_date="2024-05-02"
+    )
+
+    assert set(frames) == {"tablespace", "databasespace", "spoolspace"}
+    assert mock_read_sql.call_count == 3
+    queries = " ".join(str(call.args[0]) for call in mock_read_sql.call_args_list)
+    for table in ("TableSpace_Hst", "DatabaseSpace_Hst", "SpoolSpace_Hst"):
+        assert table in queries
+
+
+def test_get_tablespace_history_multi(mock_read_sql: Mock, wired: _Wired) -> None:
+    report, conn_mgr = wired.report, wired.conn_mgr
+    conn_mgr.engine.pool = SimpleNamespace(size=lambda: 2)
+
+    def fake_read_sql(query, con, params, **kwargs):
+        return pd.DataFrame({"DatabaseName": pd.Categorical([params["database_name"]])})
+
+    mock_read_sql.side_effect = fake_read_sql
+
+    df = report.get_tablespace_history_multi(
+        "test",
+        [("2024-01-01", "2024-01-31"), ("2024-02-01", "2024-02-29")],
+        ["Sales%", "Finance%"],
+    )
+
+    assert mock_read_sql.call_count == 4
+    assert df["DatabaseName"].tolist() == ["Sales%", "Finance%"] * 2
+    assert df["DatabaseName"].dtype == "category"
+    assert df.index.tolist() == [0, 1, 2, 3]